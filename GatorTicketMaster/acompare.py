@@ -1,6 +1,8 @@
 from difflib import Differ
+import sys
 
-def compare_files_with_line_numbers(file1_path, file2_path):
+def diff_line_numbers(file1_path, file2_path):
+    """Return the line numbers that differ in each file as (file1_lines, file2_lines)."""
     # Read the contents of the files
     with open(file1_path, 'r') as file1, open(file2_path, 'r') as file2:
         file1_lines = file1.readlines()
@@ -33,6 +35,12 @@ def compare_files_with_line_numbers(file1_path, file2_path):
             different_lines_file2.append(line_num_file2)
             # print(f"Line {line_num_file2} (output only): {line.strip()}")
 
+    return different_lines_file1, different_lines_file2
+
+
+def compare_files_with_line_numbers(file1_path, file2_path):
+    different_lines_file1, different_lines_file2 = diff_line_numbers(file1_path, file2_path)
+
     # Display the lines that are different in both files
     if different_lines_file1 or different_lines_file2:
         print("\n################## SUMMARY ##################")
@@ -43,8 +51,9 @@ def compare_files_with_line_numbers(file1_path, file2_path):
     else:
         print("The files are identical.")
 
-# Example usage
-file1 = 'test1_correct_output.txt'
-file2 = 'test1_output_file.txt'
+if __name__ == "__main__":
+    # Usage: python3 acompare.py [correct_output_file] [output_file]
+    file1 = sys.argv[1] if len(sys.argv) > 1 else 'test1_correct_output.txt'
+    file2 = sys.argv[2] if len(sys.argv) > 2 else 'test1_output_file.txt'
 
-compare_files_with_line_numbers(file1, file2)
\ No newline at end of file
+    compare_files_with_line_numbers(file1, file2)
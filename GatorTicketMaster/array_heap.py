@@ -0,0 +1,250 @@
+from array import array
+
+from red_black_tree import RedBlackTree
+
+
+class ArrayMinHeap:
+    """Drop-in replacement for MinHeap that stores entries as parallel int64 columns.
+
+    Entry i is (priorities[i], timestamps[i], users[i]). Keeping the columns in
+    array('q') instead of a list of tuples saves a tuple and three int objects per
+    entry, and the columns are compared inline while sifting.
+    """
+
+    _REBUILD_FRACTION = 4
+    probe = None  # Metrics receiver set by instrumentation.enable()
+
+    def __init__(self, ordered_index=False):
+        self.priorities = array('q')
+        self.timestamps = array('q')
+        self.users = array('q')
+        self.position_map = {}  # Map userID to index for efficient updates
+        self.user_index = RedBlackTree() if ordered_index else None
+
+    @classmethod
+    def from_iterable(cls, entries, ordered_index=False):
+        """Build a heap from (priority, timestamp, userID) tuples in O(n) with a bottom-up heapify."""
+        heap = cls(ordered_index)
+        heap.insert_many(entries)
+        return heap
+
+    def heapify(self):
+        """Restore the heap property over all entries bottom-up in O(n)."""
+        for i in range(len(self.users) // 2 - 1, -1, -1):
+            self._heapify_down(i)
+
+    @property
+    def heap(self):
+        """The entries as (priority, timestamp, userID) tuples in heap order, for MinHeap compatibility."""
+        return self.entries()
+
+    def entries(self):
+        """Return the entries as (priority, timestamp, userID) tuples in heap order."""
+        return list(zip(self.priorities, self.timestamps, self.users))
+
+    def is_empty(self):
+        """Check if the heap is empty."""
+        return len(self.users) == 0
+
+    def size(self):
+        """Return the current number of elements in the heap."""
+        return len(self.users)
+
+    def contains(self, userID):
+        """Check if the given userID is in the heap."""
+        return userID in self.position_map
+
+    def insert(self, priority, timestamp, userID):
+        """Insert a new element (priority, timestamp, userID) into the heap."""
+        self.priorities.append(priority)
+        self.timestamps.append(timestamp)
+        self.users.append(userID)
+        index = len(self.users) - 1
+        self.position_map[userID] = index
+        if self.user_index is not None:
+            self.user_index.insert(userID, timestamp)
+        self._heapify_up(index)
+
+    def insert_many(self, entries):
+        """Insert (priority, timestamp, userID) tuples in one batch, heapifying bottom-up when it is large."""
+        entries = list(entries)
+        start = len(self.users)
+        for priority, timestamp, userID in entries:
+            self.priorities.append(priority)
+            self.timestamps.append(timestamp)
+            self.users.append(userID)
+        for i in range(start, len(self.users)):
+            self.position_map[self.users[i]] = i
+        if self.user_index is not None:
+            if self.user_index.is_empty():
+                self.user_index.bulk_load(sorted((userID, timestamp) for _, timestamp, userID in entries))
+            else:
+                for _, timestamp, userID in entries:
+                    self.user_index.insert(userID, timestamp)
+
+        if len(entries) >= start:
+            self.heapify()
+        else:
+            for i in range(start, len(self.users)):
+                self._heapify_up(i)
+
+    def extract_min(self):
+        """Remove and return the smallest element from the heap."""
+        if not self.users:
+            return None
+        root = (self.priorities[0], self.timestamps[0], self.users[0])
+        if self.user_index is not None:
+            self.user_index.delete(root[2])
+        del self.position_map[root[2]]
+        self._fill_hole(0)
+        return root
+
+    def extract_many(self, k):
+        """Remove and return the k smallest elements (fewer if the heap runs out) in order.
+
+        When k is a large fraction of the heap the entries are sorted once instead: the
+        prefix is returned and the sorted remainder is already a valid heap.
+        """
+        k = min(k, len(self.users))
+        if k * self._REBUILD_FRACTION < len(self.users):
+            return [self.extract_min() for _ in range(k)]
+        ordered = sorted(self.entries())
+        popped, kept = ordered[:k], ordered[k:]
+        self.priorities = array('q', [entry[0] for entry in kept])
+        self.timestamps = array('q', [entry[1] for entry in kept])
+        self.users = array('q', [entry[2] for entry in kept])
+        self.position_map = {userID: i for i, userID in enumerate(self.users)}
+        if self.user_index is not None:
+            if len(kept) < k:
+                self.user_index = RedBlackTree()
+                self.user_index.bulk_load(sorted((userID, timestamp) for _, timestamp, userID in kept))
+            else:
+                for _, _, userID in popped:
+                    self.user_index.delete(userID)
+        return popped
+
+    def delete(self, userID):
+        """Remove the entry for userID and return it, or None if the user is not in the heap."""
+        index = self.position_map.pop(userID, None)
+        if index is None:
+            return None
+        if self.user_index is not None:
+            self.user_index.delete(userID)
+        element = (self.priorities[index], self.timestamps[index], userID)
+        self._fill_hole(index)
+        return element
+
+    def update_priority(self, userID, new_priority):
+        """Update the priority of a user in the heap, keeping the original timestamp.
+
+        Returns True if the user was found in the heap, False otherwise.
+        """
+        index = self.position_map.get(userID)
+        if index is None:
+            return False
+        current_priority = self.priorities[index]
+        if new_priority != current_priority:
+            self.priorities[index] = new_priority
+            if new_priority < current_priority:
+                self._heapify_up(index)
+            else:
+                self._heapify_down(index)
+        return True
+
+    def remove_range(self, userID1, userID2):
+        """Remove all entries with userID in the range [userID1, userID2] and return them."""
+        if self.user_index is None:
+            users = [userID for userID in self.users if userID1 <= userID <= userID2]
+        else:
+            users = [userID for userID, _ in self.user_index.delete_range(userID1, userID2)]
+        if not users:
+            return []
+
+        if len(users) * self._REBUILD_FRACTION < len(self.users):
+            removed = []
+            for userID in users:
+                index = self.position_map.pop(userID)
+                removed.append((self.priorities[index], self.timestamps[index], userID))
+                self._fill_hole(index)
+            return removed
+
+        removed = []
+        kept = []
+        for entry in zip(self.priorities, self.timestamps, self.users):
+            (removed if userID1 <= entry[2] <= userID2 else kept).append(entry)
+        self.priorities = array('q', [entry[0] for entry in kept])
+        self.timestamps = array('q', [entry[1] for entry in kept])
+        self.users = array('q', [entry[2] for entry in kept])
+        self.position_map = {userID: i for i, userID in enumerate(self.users)}
+        self.heapify()
+        return removed
+
+    def _fill_hole(self, index):
+        """Move the last entry into the hole at index (whose position_map entry is gone) and sift it."""
+        priority = self.priorities.pop()
+        timestamp = self.timestamps.pop()
+        userID = self.users.pop()
+        if index == len(self.users):
+            return
+        self.priorities[index] = priority
+        self.timestamps[index] = timestamp
+        self.users[index] = userID
+        self.position_map[userID] = index
+        parent = (index - 1) >> 1
+        if index > 0 and (priority, timestamp) < (self.priorities[parent], self.timestamps[parent]):
+            self._heapify_up(index)
+        else:
+            self._heapify_down(index)
+
+    def _heapify_up(self, index):
+        """Move the entry at index up by shifting larger parents down into the hole."""
+        priorities, timestamps, users, positions = self.priorities, self.timestamps, self.users, self.position_map
+        priority, timestamp, userID = priorities[index], timestamps[index], users[index]
+        start = index
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_priority = priorities[parent]
+            if priority > parent_priority or (priority == parent_priority and timestamp >= timestamps[parent]):
+                break
+            priorities[index] = parent_priority
+            timestamps[index] = timestamps[parent]
+            users[index] = users[parent]
+            positions[users[index]] = index
+            index = parent
+        if index != start:
+            priorities[index] = priority
+            timestamps[index] = timestamp
+            users[index] = userID
+            positions[userID] = index
+        if self.probe is not None:
+            self.probe.sift("up", (start + 1).bit_length() - (index + 1).bit_length())
+
+    def _heapify_down(self, index):
+        """Move the entry at index down by shifting smaller children up into the hole."""
+        priorities, timestamps, users, positions = self.priorities, self.timestamps, self.users, self.position_map
+        size = len(users)
+        priority, timestamp, userID = priorities[index], timestamps[index], users[index]
+        start = index
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and (priorities[right] < priorities[child] or
+                                 (priorities[right] == priorities[child] and timestamps[right] < timestamps[child])):
+                child = right
+            child_priority = priorities[child]
+            if priority < child_priority or (priority == child_priority and timestamp <= timestamps[child]):
+                break
+            priorities[index] = child_priority
+            timestamps[index] = timestamps[child]
+            users[index] = users[child]
+            positions[users[index]] = index
+            index = child
+        if index != start:
+            priorities[index] = priority
+            timestamps[index] = timestamp
+            users[index] = userID
+            positions[userID] = index
+        if self.probe is not None:
+            self.probe.sift("down", (index + 1).bit_length() - (start + 1).bit_length())
@@ -0,0 +1,79 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from acompare import diff_line_numbers
+from gatorTicketMaster import process_input
+
+OUTPUT_SUFFIX = "_output_file.txt"
+CORRECT_SUFFIX = "_correct_output.txt"
+
+
+def find_inputs(pattern):
+    """Return the input files in a directory or matching a glob, skipping output and expected-output files."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.txt")
+    return sorted(path for path in glob.glob(pattern)
+                  if not path.endswith(OUTPUT_SUFFIX) and not path.endswith(CORRECT_SUFFIX))
+
+
+def replay_file(input_file, compare=False):
+    """Run one input file through its own GatorTicketMaster and optionally diff the result."""
+    base = os.path.splitext(input_file)[0]
+    result = {"input": input_file, "output": base + OUTPUT_SUFFIX, "lines": 0, "seconds": 0.0, "status": "ok"}
+    start = time.perf_counter()
+    try:
+        result["lines"], _ = process_input(input_file)
+    except Exception as error:
+        result["status"] = f"error: {error}"
+        return result
+    result["seconds"] = time.perf_counter() - start
+
+    expected = base + CORRECT_SUFFIX
+    if compare and os.path.exists(expected):
+        different_expected, different_output = diff_line_numbers(expected, result["output"])
+        if different_expected or different_output:
+            result["status"] = f"differs: expected lines {different_expected}, output lines {different_output}"
+        else:
+            result["status"] = "identical"
+    return result
+
+
+def replay_all(inputs, workers=None, compare=False):
+    """Replay every input file in a process pool and return the per-file results in input order."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(replay_file, inputs, [compare] * len(inputs)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay many input files in parallel")
+    parser.add_argument("inputs", help="directory of input files or a glob such as 'testCases/test*.txt'")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--compare", action="store_true",
+                        help=f"diff each output against its *{CORRECT_SUFFIX} file when present")
+    args = parser.parse_args()
+
+    inputs = find_inputs(args.inputs)
+    if not inputs:
+        print(f"No input files match {args.inputs}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    results = replay_all(inputs, args.workers, args.compare)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        print(f"{result['input']}: {result['status']} ({result['lines']} lines, {result['seconds']:.3f}s)")
+    total_lines = sum(result["lines"] for result in results)
+    failed = [result for result in results if result["status"].startswith(("differs", "error"))]
+    print(f"{len(results)} files, {total_lines} lines in {elapsed:.3f}s "
+          f"({len(results) / elapsed:.1f} files/sec, {total_lines / elapsed:.0f} lines/sec), {len(failed)} failed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
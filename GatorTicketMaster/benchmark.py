@@ -0,0 +1,286 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from array_heap import ArrayMinHeap
+from command_reader import read_mapped
+from gatorTicketMaster import GatorTicketMaster, COMMANDS, parse_command
+from min_heap import MinHeap
+from output_sink import NullSink
+
+
+def generate_workload(seats=10000, churn=50000, seed=0):
+    """Generate a realistic command stream as a list of command lines.
+
+    The stream starts with an on-sale burst that oversubscribes the venue, followed by
+    churn: cancellations, new reservations, priority updates, waitlist exits, occasional
+    seat additions and large ReleaseSeats ranges. A shadow GatorTicketMaster tracks the
+    state so cancellations and priority updates target real reservations and waitlisted users.
+    """
+    rng = random.Random(seed)
+    shadow = GatorTicketMaster(None, sink=NullSink())
+    lines = []
+    next_user = 1
+
+    def emit(line):
+        lines.append(line)
+        operation, args = parse_command(line)
+        getattr(shadow, COMMANDS[operation][0])(*args)
+
+    emit(f"Initialize({seats})")
+
+    # On-sale burst: more buyers than seats, so the tail lands on the waitlist
+    for _ in range(seats + seats // 2):
+        emit(f"Reserve({next_user}, {rng.randint(1, 5)})")
+        next_user += 1
+
+    for _ in range(churn):
+        roll = rng.random()
+        if roll < 0.35:
+            user = rng.randint(1, next_user - 1)
+            seat = shadow.reserved_seats.search(user)
+            if seat is None:
+                seat = rng.randint(1, max(shadow.total_seats, 1))
+            emit(f"Cancel({seat}, {user})")
+        elif roll < 0.65:
+            emit(f"Reserve({next_user}, {rng.randint(1, 5)})")
+            next_user += 1
+        elif roll < 0.8:
+            emit(f"UpdatePriority({rng.randint(1, next_user - 1)}, {rng.randint(1, 5)})")
+        elif roll < 0.9:
+            emit(f"ExitWaitlist({rng.randint(1, next_user - 1)})")
+        elif roll < 0.93:
+            emit(f"AddSeats({rng.randint(1, max(seats // 100, 1))})")
+        elif roll < 0.95:
+            low = rng.randint(1, next_user - 1)
+            emit(f"ReleaseSeats({low}, {low + rng.randint(0, max(seats // 10, 1))})")
+        elif roll < 0.999:
+            emit("Available()")
+        else:
+            emit("PrintReservations()")
+
+    return lines
+
+
+def run_workload(lines):
+    """Run the commands against a fresh system and return per-operation latencies in seconds."""
+    system = GatorTicketMaster(None, sink=NullSink())
+    handlers = {operation: getattr(system, method) for operation, (method, _) in COMMANDS.items()}
+    commands = [parse_command(line) for line in lines]
+    latencies = {}
+    clock = time.perf_counter
+
+    start_all = clock()
+    for operation, args in commands:
+        start = clock()
+        handlers[operation](*args)
+        latencies.setdefault(operation, []).append(clock() - start)
+    return latencies, clock() - start_all
+
+
+def measure_memory(lines):
+    """Return the peak traced allocation per operation type and bytes per reservation held at the end."""
+    system = GatorTicketMaster(None, sink=NullSink())
+    handlers = {operation: getattr(system, method) for operation, (method, _) in COMMANDS.items()}
+    commands = [parse_command(line) for line in lines]
+    peaks = {}
+
+    tracemalloc.start()
+    try:
+        for operation, args in commands:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            handlers[operation](*args)
+            peak = tracemalloc.get_traced_memory()[1] - before
+            peaks[operation] = max(peaks.get(operation, 0), peak)
+        held = tracemalloc.get_traced_memory()[0]  # Before anything else is allocated
+    finally:
+        tracemalloc.stop()
+    reservations = len(system.reserved_seats)
+    per_reservation = held / reservations if reservations else 0.0
+    return peaks, per_reservation
+
+
+def measure_reservation_memory(count, seed=0):
+    """Return the bytes the two reservation trees hold per reservation after count reservations."""
+    rng = random.Random(seed)
+    users = rng.sample(range(1, count * 10), count)
+    system = GatorTicketMaster(None, sink=NullSink())
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for seat, userID in enumerate(users, 1):
+            system.reserved_seats.insert(userID, seat)
+            system.seat_index.insert(seat, userID)
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return held / count
+
+
+def compare_heaps(size, seed=0):
+    """Measure bytes per entry and ops/sec of each waitlist heap implementation at the given size."""
+    rng = random.Random(seed)
+    entries = [(-rng.randint(1, 5), timestamp, userID)
+               for timestamp, userID in enumerate(rng.sample(range(1, size * 10), size))]
+    updates = [(rng.choice(entries)[2], -rng.randint(1, 5)) for _ in range(size)]
+    results = {}
+    for heap_class in (MinHeap, ArrayMinHeap):
+        tracemalloc.start()
+        heap = heap_class()
+        for entry in entries:
+            heap.insert(*entry)
+        bytes_per_entry = tracemalloc.get_traced_memory()[0] / size
+        tracemalloc.stop()
+
+        heap = heap_class()
+        start = time.perf_counter()
+        for entry in entries:
+            heap.insert(*entry)
+        for userID, priority in updates:
+            heap.update_priority(userID, priority)
+        while not heap.is_empty():
+            heap.extract_min()
+        elapsed = time.perf_counter() - start
+        results[heap_class.__name__] = {"bytes_per_entry": bytes_per_entry, "ops_per_sec": 3 * size / elapsed}
+    return results
+
+
+def compare_readers(lines, repeat=3):
+    """Measure tokenize throughput of the text line loop and the memory-mapped reader on the same file."""
+    with tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False) as f:
+        f.write("\n".join(lines))
+        path = f.name
+    try:
+        size = os.path.getsize(path)
+
+        def line_loop():
+            with open(path, 'r') as file:
+                for line in file:
+                    try:
+                        parse_command(line)
+                    except ValueError:
+                        pass
+
+        def mapped():
+            for _ in read_mapped(path, COMMANDS):
+                pass
+
+        results = {}
+        for name, reader in (("lines", line_loop), ("mmap", mapped)):
+            elapsed = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                reader()
+                elapsed = min(elapsed, time.perf_counter() - start)
+            results[name] = {"lines_per_sec": len(lines) / elapsed, "mb_per_sec": size / elapsed / 1e6}
+        return results
+    finally:
+        os.remove(path)
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed):
+    """Build a report dict with overall and per-operation throughput and latency percentiles."""
+    total = sum(len(values) for values in latencies.values())
+    report = {"commands": total, "seconds": elapsed, "ops_per_sec": total / elapsed if elapsed else 0.0, "operations": {}}
+    for operation, values in sorted(latencies.items()):
+        values = sorted(values)
+        report["operations"][operation] = {
+            "count": len(values),
+            "ops_per_sec": len(values) / sum(values) if sum(values) else 0.0,
+            "p50_us": percentile(values, 0.50) * 1e6,
+            "p99_us": percentile(values, 0.99) * 1e6,
+        }
+    return report
+
+
+def print_report(report):
+    print(f"{report['commands']} commands in {report['seconds']:.3f}s ({report['ops_per_sec']:.0f} ops/sec)")
+    print(f"{'operation':<18}{'count':>10}{'ops/sec':>12}{'p50 us':>10}{'p99 us':>10}{'peak KiB':>10}")
+    for operation, stats in report["operations"].items():
+        peak = stats.get("peak_bytes")
+        peak_text = f"{peak / 1024:.1f}" if peak is not None else "-"
+        print(f"{operation:<18}{stats['count']:>10}{stats['ops_per_sec']:>12.0f}"
+              f"{stats['p50_us']:>10.1f}{stats['p99_us']:>10.1f}{peak_text:>10}")
+    if "bytes_per_reservation" in report:
+        print(f"Memory held per reservation: {report['bytes_per_reservation']:.1f} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GatorTicketMaster on a synthetic workload")
+    parser.add_argument("--seats", type=int, default=10000, help="seats in the on-sale burst")
+    parser.add_argument("--churn", type=int, default=50000, help="commands after the on-sale burst")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs to take the best throughput from")
+    parser.add_argument("--memory", action="store_true", help="also measure peak memory per operation type")
+    parser.add_argument("--compare-heaps", type=int, metavar="N",
+                        help="compare the MinHeap and ArrayMinHeap waitlists at N entries and exit")
+    parser.add_argument("--compare-readers", action="store_true",
+                        help="compare tokenize throughput of the line loop and the mmap reader and exit")
+    parser.add_argument("--write-workload", metavar="PATH", help="write the generated commands to an input file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write the report as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare throughput against a saved report")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="allowed throughput drop against the baseline as a fraction (default 0.10)")
+    parser.add_argument("--max-bytes-per-reservation", type=float, metavar="BYTES",
+                        help="fail when the reservation trees hold more than BYTES per reservation")
+    args = parser.parse_args()
+
+    if args.compare_heaps:
+        for name, stats in compare_heaps(args.compare_heaps, args.seed).items():
+            print(f"{name:<14}{stats['bytes_per_entry']:>10.1f} bytes/entry{stats['ops_per_sec']:>12.0f} ops/sec")
+        return
+
+    lines = generate_workload(args.seats, args.churn, args.seed)
+    if args.compare_readers:
+        for name, stats in compare_readers(lines, args.repeat).items():
+            print(f"{name:<8}{stats['lines_per_sec']:>12.0f} lines/sec{stats['mb_per_sec']:>10.1f} MB/s")
+        return
+    if args.write_workload:
+        with open(args.write_workload, 'w') as f:
+            f.write("\n".join(lines))
+
+    report = max((summarize(*run_workload(lines)) for _ in range(args.repeat)), key=lambda r: r["ops_per_sec"])
+    if args.memory:
+        peaks, per_reservation = measure_memory(lines)
+        for operation, peak in peaks.items():
+            report["operations"][operation]["peak_bytes"] = peak
+        report["bytes_per_reservation"] = per_reservation
+    print_report(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        floor = baseline["ops_per_sec"] * (1 - args.max_regression)
+        if report["ops_per_sec"] < floor:
+            print(f"REGRESSION: {report['ops_per_sec']:.0f} ops/sec is below {floor:.0f} "
+                  f"(baseline {baseline['ops_per_sec']:.0f}, allowed drop {args.max_regression:.0%})")
+            sys.exit(1)
+        print(f"OK: within {args.max_regression:.0%} of baseline {baseline['ops_per_sec']:.0f} ops/sec")
+
+    if args.max_bytes_per_reservation is not None:
+        tree_bytes = measure_reservation_memory(args.seats, args.seed)
+        if tree_bytes > args.max_bytes_per_reservation:
+            print(f"MEMORY: reservation trees hold {tree_bytes:.1f} bytes per reservation, "
+                  f"above the {args.max_bytes_per_reservation:.0f} byte ceiling")
+            sys.exit(1)
+        print(f"OK: reservation trees hold {tree_bytes:.1f} bytes per reservation "
+              f"(ceiling {args.max_bytes_per_reservation:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import mmap
+import os
+import re
+
+# Bytes version of gatorTicketMaster.COMMAND_PATTERN anchored to one whole line (or the unterminated last one)
+LINE_PATTERN = re.compile(rb"[ \t]*(\w+)[ \t]*\([ \t]*(?:(-?\d+)[ \t]*(?:,[ \t]*(-?\d+)[ \t]*)?)?\)[ \t\r\f\v]*(?:\n|\Z)")
+BLANK_PATTERN = re.compile(rb"[ \t\r\f\v]*(?:\n|\Z)")
+CHUNK_SIZE = 1 << 16
+
+
+def check_arity(operation, arity, args):
+    """Raise ValueError unless len(args) fits arity, an argument count or a tuple of allowed counts."""
+    allowed = arity if isinstance(arity, tuple) else (arity,)
+    if len(args) not in allowed:
+        expected = " or ".join(str(count) for count in allowed)
+        raise ValueError(f"{operation} expects {expected} argument(s), got {len(args)}")
+
+
+def tokenize(buffer, commands, pos=0, end=None):
+    """Yield (next_offset, command) for each line of buffer[pos:end].
+
+    buffer can be bytes, a bytearray or an mmap. Lines are matched in place, so no
+    per-line str is built. command is (operation, args) like parse_command returns,
+    None for a blank line, or a ValueError for a malformed or unknown command.
+    """
+    if end is None:
+        end = len(buffer)
+    names = {name.encode(): (name, arity) for name, (_, arity) in commands.items()}
+    match_line = LINE_PATTERN.match
+    while pos < end:
+        match = match_line(buffer, pos, end)
+        if match is None:
+            blank = BLANK_PATTERN.match(buffer, pos, end)
+            if blank is not None:
+                pos = blank.end()
+                yield pos, None
+                continue
+            newline = buffer.find(b"\n", pos, end)
+            next_pos = end if newline == -1 else newline + 1
+            line = bytes(buffer[pos:next_pos]).strip().decode(errors="replace")
+            pos = next_pos
+            yield pos, ValueError(f"malformed command: {line}")
+            continue
+
+        pos = match.end()
+        name, first, second = match.groups()
+        entry = names.get(name)
+        if entry is None:
+            yield pos, ValueError(f"unknown command: {name.decode(errors='replace')}")
+            continue
+        operation, arity = entry
+        if second is not None:
+            args = (int(first), int(second))
+        elif first is not None:
+            args = (int(first),)
+        else:
+            args = ()
+        try:
+            check_arity(operation, arity, args)
+        except ValueError as error:
+            yield pos, error
+        else:
+            yield pos, (operation, args)
+
+
+def read_mapped(path, commands, start_offset=0):
+    """Tokenize a file through a read-only memory map, starting at byte start_offset.
+
+    start_offset should be a line boundary, such as an offset yielded by an earlier run.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)  # Let the kernel read ahead aggressively
+            yield from tokenize(mapped, commands, start_offset)
+
+
+def read_stream(stream, commands, start_offset=0):
+    """Tokenize a binary stream such as sys.stdin.buffer as data arrives.
+
+    Only complete lines are tokenized; a partial last line waits for the next read, so a
+    pipe fed by `tail -f` is processed as it grows. Offsets are absolute positions in the
+    stream, whose first start_offset bytes are skipped.
+    """
+    read = getattr(stream, "read1", stream.read)  # read1 returns whatever a pipe has ready
+    base = start_offset  # Stream offset of buffer[0]
+    while start_offset > 0:
+        data = read(min(start_offset, CHUNK_SIZE))
+        if not data:
+            return
+        start_offset -= len(data)
+    buffer = bytearray()
+    while True:
+        data = read(CHUNK_SIZE)
+        if data:
+            buffer += data
+            end = buffer.rfind(b"\n") + 1
+        else:
+            end = len(buffer)  # At EOF an unterminated last line is complete too
+        if end:
+            for next_offset, command in tokenize(buffer, commands, 0, end):
+                yield base + next_offset, command
+            del buffer[:end]
+            base += end
+        if not data:
+            return
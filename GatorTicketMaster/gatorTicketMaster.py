@@ -1,65 +1,243 @@
 from red_black_tree import RedBlackTree
+from persistent_tree import PersistentRedBlackTree
 from min_heap import MinHeap
+from seat_pool import SeatPool
+from array_heap import ArrayMinHeap
+from output_sink import FileSink, NullSink
+from snapshot import load_snapshot, save_snapshot
+from write_ahead_log import WriteAheadLog, read_log
+from command_reader import check_arity, read_mapped, read_stream
+from timer_wheel import TimerWheel
+from contextlib import closing
+from itertools import islice
+import instrumentation
+import argparse
+import re
 import sys
 import os
+import time
+
+class ReservationView:
+    """Immutable, versioned view of the seat listing and counters at one point in time.
+
+    The seat listing shares nodes with the persistent seat index and is never modified,
+    so reader threads can answer Available and PrintReservations from a view without
+    locks while the writer keeps publishing newer ones.
+    """
+
+    def __init__(self, version, seats, available_count, waitlist_size):
+        self.version = version
+        self.seats = seats  # PersistentRedBlackTree of seatID -> userID
+        self.available_count = available_count
+        self.waitlist_size = waitlist_size
+
+    def available(self):
+        return f"Total Seats Available : {self.available_count}, Waitlist : {self.waitlist_size}"
+
+    def reservations(self, start=None, count=None):
+        """Yield the PrintReservations lines in seat order, optionally count of them from seat start."""
+        pairs = self.seats.range_items(start, None)
+        if count is not None:
+            pairs = islice(pairs, max(count, 0))
+        for seat, user in pairs:
+            yield f"Seat {seat}, User {user}"
+
+    def run(self, operation, args):
+        """Return the output lines of a read-only command, as GatorTicketMaster would write them."""
+        if operation == "Available":
+            return [self.available()]
+        if operation == "PrintReservations":
+            return list(self.reservations(*args))
+        raise ValueError(f"{operation} is not a read-only command")
+
 
 class GatorTicketMaster:
-    def __init__(self, output_file):
-        self.available_seats = MinHeap()
-        self.reserved_seats = RedBlackTree()
-        self.waitlist = MinHeap()
+    def __init__(self, output_file, sink=None, debug=False, wal=None, waitlist=None, clock=None, views=False):
+        self.available_seats = SeatPool()
+        self.reserved_seats = RedBlackTree()  # userID -> seatID
+        # seatID -> userID, kept in step with reserved_seats. With views it is path-copying,
+        # so publish_view can hand out O(1) snapshots of it.
+        self.seat_index = PersistentRedBlackTree() if views else RedBlackTree()
+        # Any heap with the MinHeap API, e.g. array_heap.ArrayMinHeap for very large waitlists
+        self.waitlist = waitlist if waitlist is not None else MinHeap(ordered_index=True)
         self.output_file = output_file
-        self.output_lines = []
+        # Output goes to a pluggable sink; by default a buffered writer for output_file
+        self.sink = sink if sink is not None else FileSink(output_file)
+        self.debug = debug  # Echo every output line to stdout when enabled
+        self.wal = wal  # Optional WriteAheadLog that mutating commands are recorded to before they run
         self.timestamp = 0  # Used for ordering users on the waitlist
         self.total_seats = 0  # Tracks the total seats initialized or added
+        # Seat holds: userID -> (seatID, deadline), with the deadlines tracked on a timer wheel.
+        # The clock is injectable so simulations and replays can use logical time.
+        self.clock = clock if clock is not None else time.monotonic
+        self.holds = {}
+        self.hold_timers = TimerWheel(start=self.clock())
+        self.view = ReservationView(0, PersistentRedBlackTree(), 0, 0) if views else None
 
 
     def _write_output(self, message):
-        self.output_lines.append(message)
-        print(f"[DEBUG] {message}")  # Debug statement to trace operations
+        self.sink.write(message)
+        if self.debug:
+            print(f"[DEBUG] {message}")  # Debug statement to trace operations
+
+    def _log(self, operation, *args):
+        if self.wal is not None:
+            self.wal.append(operation, args)
+
+    def _assign_seat(self, userID, seatID):
+        """Record that userID holds seatID in both reservation indexes."""
+        self.reserved_seats.insert(userID, seatID)
+        self.seat_index.insert(seatID, userID)
+
+    def _release_seat(self, userID, seatID):
+        """Take seatID away from userID and give it to the next waitlisted user, or return it to the pool.
+
+        Returns the userID the seat went to, or None if nobody was waiting.
+        """
+        self.reserved_seats.delete(userID)
+        self.seat_index.delete(seatID)
+        if not self.waitlist.is_empty():
+            priority, timestamp, waitlist_user = self.waitlist.extract_min()
+            self._assign_seat(waitlist_user, seatID)
+            return waitlist_user
+        # If no waitlist users, add seat back to available
+        self.available_seats.insert(seatID)
+        return None
+
+    def publish_view(self):
+        """Publish a ReservationView of the current state; call after each mutation batch.
+
+        Replacing self.view is a single reference assignment, so a reader that grabbed
+        the previous view keeps a consistent one.
+        """
+        self.view = ReservationView(self.view.version + 1, self.seat_index.snapshot(),
+                                    self.available_seats.size(), self.waitlist.size())
 
     def save_output(self):
-        with open(self.output_file, 'w') as f:
-            f.write("\n".join(self.output_lines))
+        """Flush any buffered output and close the sink, committing the write-ahead log if there is one."""
+        self.sink.close()
+        if self.wal is not None:
+            self.wal.close()
 
     def initialize(self, seat_count):
         """Initialize available seats and set total seats."""
-        for seat in range(1, seat_count + 1):
-            self.available_seats.insert(seat, 0, 0)  # Using seat number as priority for MinHeap
+        self._log("Initialize", seat_count)
+        self.available_seats.add_range(1, seat_count)
         self.total_seats = seat_count
         self._write_output(f"{seat_count} Seats are made available for reservation")
 
     def available(self):
         """Show the number of available seats and waitlist size."""
         available_count = self.available_seats.size()
-        waitlist_length = len(self.waitlist.heap)
+        waitlist_length = self.waitlist.size()
         self._write_output(f"Total Seats Available : {available_count}, Waitlist : {waitlist_length}")
 
 
 
     def reserve(self, userID, userPriority):
         """Reserve a seat for the user if available, else add to waitlist."""
+        self._log("Reserve", userID, userPriority)
         if not self.available_seats.is_empty():
-            seat = self.available_seats.extract_min()[0]
-            self.reserved_seats.insert(userID, seat)
+            seat = self.available_seats.extract_min()
+            self._assign_seat(userID, seat)
             self._write_output(f"User {userID} reserved seat {seat}")
         else:
-            self.waitlist.insert(userPriority, self.timestamp, userID)
+            # The waitlist is a min-heap, so priorities are negated to serve the highest priority first
+            self.waitlist.insert(-userPriority, self.timestamp, userID)
+            self.timestamp += 1
+            self._write_output(f"User {userID} is added to the waiting list")
+
+    def hold(self, userID, ttl):
+        """Hold the lowest free seat for userID for ttl clock units until it is confirmed."""
+        self._log("Hold", userID, ttl)
+        if self.reserved_seats.contains(userID):
+            self._write_output(f"User {userID} already has a seat")
+        elif self.available_seats.is_empty():
+            self._write_output(f"User {userID} cannot hold a seat, none are available")
+        else:
+            seat = self.available_seats.extract_min()
+            self._assign_seat(userID, seat)
+            deadline = self.clock() + ttl
+            self.holds[userID] = (seat, deadline)
+            self.hold_timers.schedule(deadline, (userID, seat, deadline))
+            self._write_output(f"User {userID} is holding seat {seat}")
+
+    def confirm(self, userID):
+        """Turn userID's hold into a regular reservation."""
+        self._log("Confirm", userID)
+        hold = self.holds.pop(userID, None)
+        if hold is not None:
+            self._write_output(f"User {userID} confirmed seat {hold[0]}")
+        else:
+            self._write_output(f"User {userID} has no hold to confirm")
+
+    def expire_holds(self):
+        """Release every hold whose deadline has passed, as if its holder had canceled.
+
+        Only the wheel slots for the ticks since the last sweep are visited. Timers of
+        holds that were confirmed or canceled in the meantime are skipped. Each expiry
+        is logged as a Cancel so that replaying the log does not depend on the clock.
+        """
+        for userID, seatID, deadline in self.hold_timers.advance(self.clock()):
+            if self.holds.get(userID) != (seatID, deadline):
+                continue
+            del self.holds[userID]
+            self._log("Cancel", seatID, userID)
+            waitlist_user = self._release_seat(userID, seatID)
+            if waitlist_user is not None:
+                self._write_output(f"User {userID}'s hold on seat {seatID} expired\nUser {waitlist_user} reserved seat {seatID}")
+            else:
+                self._write_output(f"User {userID}'s hold on seat {seatID} expired")
+
+    def reserve_many(self, requests):
+        """Reserve seats for a burst of (userID, userPriority) requests.
+
+        Produces the same state and output as calling reserve for each request in order,
+        but takes the free seats in one pass, bulk-loads the reservation trees when they
+        are empty and heapifies the overflow onto the waitlist at once.
+        """
+        requests = list(requests)
+        if self.wal is not None:
+            for userID, userPriority in requests:
+                self.wal.append("Reserve", (userID, userPriority))
+        seats = self.available_seats.extract_many(len(requests))
+        granted = list(zip(seats, requests))
+        overflow = requests[len(seats):]
+
+        by_user = sorted((userID, seat) for seat, (userID, _) in granted)
+        if self.reserved_seats.is_empty():
+            self.reserved_seats.bulk_load(by_user)
+        else:
+            for userID, seat in by_user:
+                self.reserved_seats.insert(userID, seat)
+        by_seat = [(seat, userID) for seat, (userID, _) in granted]  # Seats come out in ascending order
+        if self.seat_index.is_empty():
+            self.seat_index.bulk_load(by_seat)
+        else:
+            for seat, userID in by_seat:
+                self.seat_index.insert(seat, userID)
+
+        entries = []
+        for userID, userPriority in overflow:
+            entries.append((-userPriority, self.timestamp, userID))
             self.timestamp += 1
+        self.waitlist.insert_many(entries)
+
+        for seat, (userID, _) in granted:
+            self._write_output(f"User {userID} reserved seat {seat}")
+        for userID, _ in overflow:
             self._write_output(f"User {userID} is added to the waiting list")
 
     def cancel(self, seatID, userID):
         """Cancel a reservation. Reassign seat if there's a waitlist, else add to available."""
+        self._log("Cancel", seatID, userID)
         current_seat = self.reserved_seats.search(userID)
         if current_seat == seatID:
-            self.reserved_seats.delete(userID)
-            if not self.waitlist.is_empty():
-                priority, timestamp, waitlist_user = self.waitlist.extract_min()
-                self.reserved_seats.insert(waitlist_user, seatID)
+            self.holds.pop(userID, None)  # Canceling a held seat drops the hold
+            waitlist_user = self._release_seat(userID, seatID)
+            if waitlist_user is not None:
                 self._write_output(f"User {userID} canceled their reservation\nUser {waitlist_user} reserved seat {seatID}")
             else:
-                # If no waitlist users, add seat back to available
-                self.available_seats.insert(seatID, 0, 0)
                 self._write_output(f"User {userID} canceled their reservation")
         else:
             # Handle invalid cancellation attempt
@@ -67,166 +245,301 @@ class GatorTicketMaster:
 
     def add_seats(self, count):
         """Add new seats, assigning them to waitlist users first if any."""
+        self._log("AddSeats", count)
         start_seat = self.total_seats + 1
         self.total_seats += count
         self._write_output(f"Additional {count} Seats are made available for reservation")
 
-        for seat_id in range(start_seat, start_seat + count):
-            if not self.waitlist.is_empty():
-                priority, timestamp, waitlist_user = self.waitlist.extract_min()
-                self.reserved_seats.insert(waitlist_user, seat_id)
-                self._write_output(f"User {waitlist_user} reserved seat {seat_id}")
-            else:
-                # Add new seats to available seats if no one is on the waitlist
-                self.available_seats.insert(seat_id, 0, 0)
+        # Waitlisted users take the lowest new seats, popped from the waitlist in one batch
+        promoted = self.waitlist.extract_many(count)
+        for seat_id, (_, _, waitlist_user) in enumerate(promoted, start_seat):
+            self._assign_seat(waitlist_user, seat_id)
+            self._write_output(f"User {waitlist_user} reserved seat {seat_id}")
+
+        # Remaining new seats go to the free pool as a single run
+        self.available_seats.add_range(start_seat + len(promoted), start_seat + count - 1)
 
     def update_priority(self, userID, new_priority):
-        # Check if the user is in the waitlist
-        found = False
-        for i, (priority, timestamp, uid) in enumerate(self.waitlist.heap):
-            if uid == userID:
-                # Update the user with the new priority, keeping the original timestamp
-                found = True
-                _, original_timestamp, _ = self.waitlist.heap.pop(i)
-                self.waitlist._rebuild_heap()  # Restore heap property after removal
-                self.waitlist.insert(new_priority, original_timestamp, userID)
-                self._write_output(f"User {userID} priority has been updated to {new_priority}")
-                break
-
-        if not found:
+        """Update a waitlisted user's priority, keeping their original timestamp."""
+        self._log("UpdatePriority", userID, new_priority)
+        if self.waitlist.update_priority(userID, -new_priority):
+            self._write_output(f"User {userID} priority has been updated to {new_priority}")
+        else:
             # If the user is not in the waitlist
             self._write_output(f"User {userID} priority is not updated")
 
     def exit_waitlist(self, userID):
-        # Locate the user in the waitlist
-        found = False
-        for i, (priority, timestamp, uid) in enumerate(self.waitlist.heap):
-            if uid == userID:
-                # Remove the user and rebuild the heap
-                found = True
-                self.waitlist.heap.pop(i)
-                self.waitlist._rebuild_heap()  # Restore heap after removal
-                self._write_output(f"User {userID} is removed from the waiting list")
-                break
-
-        if not found:
+        """Remove a user from the waitlist."""
+        self._log("ExitWaitlist", userID)
+        if self.waitlist.delete(userID) is not None:
+            self._write_output(f"User {userID} is removed from the waiting list")
+        else:
             # User was not in the waitlist
             self._write_output(f"User {userID} is not in waitlist")
 
 
     def release_seats(self, userID1, userID2):
         """Release all seats held by users within the range [userID1, userID2]."""
+        self._log("ReleaseSeats", userID1, userID2)
+        released = self.reserved_seats.delete_range(userID1, userID2)
         released_seats = []
-        for user_id in range(userID1, userID2 + 1):
-            seat_id = self.reserved_seats.search(user_id)
-            if seat_id:
-                self.reserved_seats.delete(user_id)
-                released_seats.append(seat_id)
+        for userID, seat_id in released:
+            self.seat_index.delete(seat_id)
+            self.holds.pop(userID, None)
+            released_seats.append(seat_id)
 
-        released_seats.sort()
+        released_seats.sort()  # They come out of the tree in userID order
         self.waitlist.remove_range(userID1, userID2)
 
         self._write_output(f"Reservations of the Users in the range [{userID1}, {userID2}] are released")
 
-        for seat_id in released_seats:
-            if not self.waitlist.is_empty():
-                priority, timestamp, next_user = self.waitlist.extract_min()
-                self.reserved_seats.insert(next_user, seat_id)
-                self._write_output(f"User {next_user} reserved seat {seat_id}")
-            else:
-                # If no users in waitlist, seat goes back to available seats
-                self.available_seats.insert(seat_id, 0, 0)
-
-
-    def print_reservations(self):
-        reservations = self.reserved_seats.in_order_traversal()
-        for seat, user in sorted(reservations, key=lambda x: x[0]):
+        # Only min(k, waitlist size) users are popped, in one batch, and take the lowest seats
+        promoted = self.waitlist.extract_many(len(released_seats))
+        for seat_id, (_, _, next_user) in zip(released_seats, promoted):
+            self._assign_seat(next_user, seat_id)
+            self._write_output(f"User {next_user} reserved seat {seat_id}")
+
+        # Seats nobody was waiting for are merged back into the free pool in one linear pass
+        self.available_seats.merge_sorted(released_seats[len(promoted):])
+
+
+    def seat_holder(self, seatID):
+        """Return the userID holding seatID, or None if the seat is not reserved."""
+        return self.seat_index.search(seatID)
+
+    def iter_reservations(self, by="seat", offset=0, cursor=None):
+        """Lazily yield (seatID, userID) pairs ordered by seat or by user.
+
+        Skipping offset reservations costs O(log n) through the trees' order statistics,
+        and the walk holds no more than one tree path, so memory stays constant. cursor
+        resumes after the last reservation of a page returned by reservation_page.
+        """
+        if by not in ("seat", "user"):
+            raise ValueError(f"reservations can be listed by seat or by user, not {by!r}")
+        tree = self.seat_index if by == "seat" else self.reserved_seats
+        low = None
+        if cursor is not None:
+            kind, _, key = cursor.partition(":")
+            if kind != by or not key.lstrip("-").isdigit():
+                raise ValueError(f"{cursor!r} is not a cursor for reservations by {by}")
+            low = int(key) + 1
+        if offset > 0:
+            first = tree.select(offset + (tree.rank(low) if low is not None else 0))
+            if first is None:
+                return
+            low = first[0]
+        for key, value in tree.range_items(low, None):
+            yield (key, value) if by == "seat" else (value, key)
+
+    def reservation_page(self, by="seat", offset=0, limit=None, cursor=None):
+        """Return (pairs, next_cursor) for up to limit reservations; next_cursor is None after the last page.
+
+        Cursors name the last key returned rather than a position, so a listing resumed
+        after other changes neither repeats nor skips reservations that stayed in place.
+        A limit of 0 or less returns an empty, final page.
+        """
+        if limit is not None and limit <= 0:
+            return [], None
+        pairs = list(islice(self.iter_reservations(by, offset, cursor), limit))
+        if limit is None or len(pairs) < limit:
+            return pairs, None
+        seat, user = pairs[-1]
+        return pairs, f"{by}:{seat if by == 'seat' else user}"
+
+    def print_reservations(self, start=None, count=None):
+        """List reservations ordered by seat, or only count of them from seat start on.
+
+        Each line is written as the seat index is walked, so the listing is never held in memory.
+        """
+        pairs = self.seat_index.range_items(start, None)
+        if count is not None:
+            pairs = islice(pairs, max(count, 0))
+        for seat, user in pairs:
             self._write_output(f"Seat {seat}, User {user}")
 
 
     def quit(self):
         self._write_output("Program Terminated!!")
         self.save_output()
-        sys.exit(0)
 
-def process_input(input_file):
+# Operation name -> (GatorTicketMaster method, number of integer arguments or a tuple of allowed numbers)
+COMMANDS = {
+    "Initialize": ("initialize", 1),
+    "Available": ("available", 0),
+    "Reserve": ("reserve", 2),
+    "Cancel": ("cancel", 2),
+    "AddSeats": ("add_seats", 1),
+    "ReleaseSeats": ("release_seats", 2),
+    "UpdatePriority": ("update_priority", 2),
+    "ExitWaitlist": ("exit_waitlist", 1),
+    "PrintReservations": ("print_reservations", (0, 2)),  # Optionally (start seat, count)
+    "Hold": ("hold", 2),
+    "Confirm": ("confirm", 1),
+    "Quit": ("quit", 0),
+}
+
+# Operation(arg1, arg2) with zero to two integer arguments
+COMMAND_PATTERN = re.compile(r"\s*(\w+)\s*\(\s*(?:(-?\d+)\s*(?:,\s*(-?\d+)\s*)?)?\)\s*$")
+
+
+def parse_command(line):
+    """Parse one command line into (operation, args).
+
+    Returns None for blank lines and raises ValueError for malformed or unknown commands.
+    """
+    match = COMMAND_PATTERN.match(line)
+    if match is None:
+        if not line.strip():
+            return None
+        raise ValueError(f"malformed command: {line.strip()}")
+
+    operation, first, second = match.groups()
+    if operation not in COMMANDS:
+        raise ValueError(f"unknown command: {operation}")
+    if second is not None:
+        args = (int(first), int(second))
+    elif first is not None:
+        args = (int(first),)
+    else:
+        args = ()
+    check_arity(operation, COMMANDS[operation][1], args)
+    return operation, args
+
+
+def recover_from_log(system, log_path):
+    """Replay a write-ahead log into a fresh system and return the number of commands replayed."""
+    wal, system.wal = system.wal, None  # Replayed commands must not be logged again
+    replayed = 0
+    for line in read_log(log_path):
+        command = parse_command(line)
+        if command is not None:
+            operation, args = command
+            getattr(system, COMMANDS[operation][0])(*args)
+            replayed += 1
+    system.wal = wal
+    return replayed
+
+
+def read_commands(input_file, skip_lines=0, mapped=False, start_offset=0):
+    """Yield (next_offset, command) for each input line after the first skip_lines.
+
+    command is what parse_command returns, or the ValueError it raised, and next_offset
+    is the byte offset just past the line, which --start-offset accepts to resume there.
+    "-" streams from stdin; mapped (or a start_offset) tokenizes the file from a memory
+    map instead of decoding it line by line.
+    """
+    if input_file == "-":
+        tokens = read_stream(sys.stdin.buffer, COMMANDS, start_offset)
+    elif mapped or start_offset:
+        tokens = read_mapped(input_file, COMMANDS, start_offset)
+    else:
+        offset = 0
+        with open(input_file, 'rb') as file:
+            for line in file:
+                offset += len(line)
+                if skip_lines:
+                    skip_lines -= 1
+                    continue
+                try:
+                    yield offset, parse_command(line.decode())
+                except ValueError as error:
+                    yield offset, error
+        return
+    with closing(tokens):
+        yield from islice(tokens, skip_lines, None)
+
+
+def process_input(input_file, debug=False, snapshot=None, snapshot_out=None, wal=None, recover=False,
+                  array_waitlist=False, mapped=False, start_offset=0, snapshot_every=0):
     # Create the output file name by appending "_output_file.txt" to the input file name (without extension)
-    input_filename_without_ext = os.path.splitext(input_file)[0]
+    input_filename_without_ext = os.path.splitext(input_file)[0] if input_file != "-" else "stdin"
     output_file = f"{input_filename_without_ext}_output_file.txt"
 
     # Initialize the system with the output file name
-    system = GatorTicketMaster(output_file)
-
-    with open(input_file, 'r') as file:
-        for line in file:
-            # Split command and arguments
-            command = line.strip().split('(')
-            operation = command[0].strip()
-
-            # Handle Initialize(seatCount)
-            if operation == "Initialize":
-                seat_count = int(command[1][:-1])  # Extract seat count
-                system.initialize(seat_count)
-
-            # Handle Available()
-            elif operation == "Available":
-                system.available()
-
-            # Handle Reserve(userID, userPriority)
-            elif operation == "Reserve":
-                params = command[1][:-1].split(',')
-                user_id = int(params[0].strip())
-                user_priority = int(params[1].strip())
-                system.reserve(user_id, user_priority)
-
-            # Handle Cancel(seatID, userID)
-            elif operation == "Cancel":
-                params = command[1][:-1].split(',')
-                seat_id = int(params[0].strip())
-                user_id = int(params[1].strip())
-                system.cancel(seat_id, user_id)
-
-            # Handle AddSeats(count)
-            elif operation == "AddSeats":
-                try:
-                    count = int(command[1][:-1].strip())  # Extract seat count to add
-                    system.add_seats(count)
-                except ValueError:
-                    system._write_output("Invalid input. Please provide a valid number of seats.")
-
-            # Handle ReleaseSeats(userID1, userID2)
-            elif operation == "ReleaseSeats":
-                params = command[1][:-1].split(',')
-                user_id1 = int(params[0].strip())
-                user_id2 = int(params[1].strip())
-                system.release_seats(user_id1, user_id2)
-
-            # Handle UpdatePriority(userID, userPriority)
-            elif operation == "UpdatePriority":
-                params = command[1][:-1].split(',')
-                user_id = int(params[0].strip())
-                new_priority = int(params[1].strip())
-                system.update_priority(user_id, new_priority)
-
-            # Handle ExitWaitlist(userID)
-            elif operation == "ExitWaitlist":
-                user_id = int(command[1][:-1].strip())
-                system.exit_waitlist(user_id)
-
-            # Handle PrintReservations()
-            elif operation == "PrintReservations":
-                system.print_reservations()
-
-            # Handle Quit()
-            elif operation == "Quit":
-                system.quit()
+    waitlist = ArrayMinHeap(ordered_index=True) if array_waitlist else None
+    system = GatorTicketMaster(output_file, debug=debug, waitlist=waitlist)
+    if recover and wal is not None:
+        # Rebuild the state recorded in the log without echoing its output again
+        sink, system.sink = system.sink, NullSink()
+        recover_from_log(system, wal.path)
+        system.sink = sink
+    system.wal = wal
+    handlers = {operation: getattr(system, method) for operation, (method, _) in COMMANDS.items()}
+    if instrumentation.metrics is not None:
+        handlers = instrumentation.timed_handlers(handlers)
+
+    # Start from a snapshot and replay only the lines after the position it was taken at
+    skip_lines = load_snapshot(system, snapshot) if snapshot else 0
+    line_number = skip_lines
+    offset = start_offset
+
+    # Line numbers count from start_offset when one is given
+    with closing(read_commands(input_file, skip_lines, mapped, start_offset)) as commands:
+        for line_number, (offset, command) in enumerate(commands, skip_lines + 1):
+            if isinstance(command, ValueError):
+                # Report and skip the line instead of aborting the whole run
+                print(f"{input_file}:{line_number}: {command}", file=sys.stderr)
+            elif command is not None:
+                operation, args = command
+                if system.holds:
+                    system.expire_holds()
+                handlers[operation](*args)
+                if operation == "Quit":
+                    # Anything below Quit() is not processed
+                    break
+            if snapshot_every and line_number % snapshot_every == 0:
+                # Periodic checkpoint, so a crash only costs the lines since the last one
+                save_snapshot(system, snapshot_out, line_number)
 
     # Ensure that output is saved even if the 'Quit()' command is not explicitly called
     system.save_output()
+    if snapshot_out:
+        save_snapshot(system, snapshot_out, max(line_number, skip_lines))
+    # Input lines processed in this run, and the byte offset just past the last one consumed
+    return max(line_number - skip_lines, 0), offset
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python3 gatorTicketMaster.py <input_file>")
-        sys.exit(1)
-    process_input(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Gator Ticket Master")
+    parser.add_argument("input_file", help="file with one command per line, or - to stream from stdin")
+    parser.add_argument("--debug", action="store_true", help="echo every output line to stdout")
+    parser.add_argument("--snapshot", metavar="PATH", help="restore state from a snapshot and replay only the log tail")
+    parser.add_argument("--save-snapshot", metavar="PATH", help="write a snapshot of the final state")
+    parser.add_argument("--snapshot-every", type=int, default=0, metavar="N",
+                        help="also rewrite the --save-snapshot file every N input lines")
+    parser.add_argument("--wal", metavar="PATH", help="record mutating commands to a write-ahead log")
+    parser.add_argument("--wal-batch", type=int, default=128, help="records per fsync (default 128)")
+    parser.add_argument("--wal-interval-ms", type=float, default=10.0, help="max milliseconds between fsyncs (default 10)")
+    parser.add_argument("--recover", action="store_true", help="replay the existing write-ahead log before the input")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="collect per-operation metrics and write them at exit (JSON for *.json, else Prometheus text)")
+    parser.add_argument("--array-waitlist", action="store_true", help="store the waitlist in parallel int64 arrays")
+    parser.add_argument("--mmap", action="store_true",
+                        help="tokenize the input from a memory map instead of decoding it line by line")
+    parser.add_argument("--start-offset", type=int, default=0, metavar="BYTES",
+                        help="start reading at this byte offset, which must be a line boundary")
+    args = parser.parse_args()
+    if args.metrics:
+        instrumentation.enable(args.metrics)
+    if args.recover and not args.wal:
+        parser.error("--recover requires --wal")
+    if args.start_offset and (args.snapshot or args.save_snapshot):
+        parser.error("snapshots record line positions and cannot be combined with --start-offset")
+    if args.snapshot_every and not args.save_snapshot:
+        parser.error("--snapshot-every requires --save-snapshot")
+    if args.snapshot_every < 0:
+        parser.error("--snapshot-every must be positive")
+    if args.recover and args.snapshot:
+        # Snapshots count input lines while the log counts mutations, so neither can resume the other
+        parser.error("--recover rebuilds the state from the log and cannot be combined with --snapshot")
+    if args.wal and not args.recover and os.path.exists(args.wal) and os.path.getsize(args.wal) > 0:
+        parser.error(f"{args.wal} already holds records; pass --recover to continue it or remove it to start afresh")
+    wal = WriteAheadLog(args.wal, args.wal_batch, args.wal_interval_ms) if args.wal else None
+    _, offset = process_input(args.input_file, debug=args.debug, snapshot=args.snapshot,
+                              snapshot_out=args.save_snapshot, wal=wal, recover=args.recover,
+                              array_waitlist=args.array_waitlist, mapped=args.mmap,
+                              start_offset=args.start_offset, snapshot_every=args.snapshot_every)
+    # Report where reading stopped when there may be more to read: a stream, a growing log or lines after Quit()
+    if args.input_file == "-" or args.mmap or args.start_offset or offset < os.path.getsize(args.input_file):
+        print(f"{args.input_file}: stopped at byte offset {offset}; pass --start-offset {offset} to resume",
+              file=sys.stderr)
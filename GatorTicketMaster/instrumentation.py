@@ -0,0 +1,123 @@
+import atexit
+import json
+import time
+
+from array_heap import ArrayMinHeap
+from min_heap import MinHeap
+from red_black_tree import RedBlackTree
+
+# The active Metrics while instrumentation is enabled, otherwise None
+metrics = None
+
+
+class Metrics:
+    """Counters collected while instrumentation is enabled.
+
+    MinHeap, ArrayMinHeap and RedBlackTree report into the active instance through their class-level
+    `probe` attribute, which is None (a single attribute check per call) when disabled.
+    """
+
+    def __init__(self):
+        self.commands = {}  # operation -> [calls, total seconds, max seconds]
+        self.sifts = {"up": [0, 0, 0], "down": [0, 0, 0]}  # direction -> [sifts, total levels, max levels]
+        self.rotations = 0
+        self.fix_insert = [0, 0]  # [calls, loop iterations]
+        self.fix_delete = [0, 0]
+
+    def command(self, operation, seconds):
+        stats = self.commands.setdefault(operation, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+
+    def sift(self, direction, levels):
+        stats = self.sifts[direction]
+        stats[0] += 1
+        stats[1] += levels
+        if levels > stats[2]:
+            stats[2] = levels
+
+    def rotation(self):
+        self.rotations += 1
+
+    def fixup(self, kind, iterations):
+        stats = self.fix_insert if kind == "insert" else self.fix_delete
+        stats[0] += 1
+        stats[1] += iterations
+
+    def to_dict(self):
+        return {
+            "commands": {operation: {"calls": calls, "total_seconds": total, "max_seconds": worst}
+                         for operation, (calls, total, worst) in sorted(self.commands.items())},
+            "heap_sifts": {direction: {"sifts": sifts, "levels": levels, "max_levels": worst}
+                           for direction, (sifts, levels, worst) in self.sifts.items()},
+            "rbtree": {"rotations": self.rotations,
+                       "fix_insert_calls": self.fix_insert[0], "fix_insert_iterations": self.fix_insert[1],
+                       "fix_delete_calls": self.fix_delete[0], "fix_delete_iterations": self.fix_delete[1]},
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """Render the counters in the Prometheus text exposition format."""
+        lines = []
+        for operation, (calls, total, worst) in sorted(self.commands.items()):
+            label = f'{{operation="{operation}"}}'
+            lines.append(f"gtm_command_calls_total{label} {calls}")
+            lines.append(f"gtm_command_seconds_total{label} {total:.9f}")
+            lines.append(f"gtm_command_seconds_max{label} {worst:.9f}")
+        for direction, (sifts, levels, worst) in self.sifts.items():
+            label = f'{{direction="{direction}"}}'
+            lines.append(f"gtm_heap_sifts_total{label} {sifts}")
+            lines.append(f"gtm_heap_sift_levels_total{label} {levels}")
+            lines.append(f"gtm_heap_sift_levels_max{label} {worst}")
+        lines.append(f"gtm_rbtree_rotations_total {self.rotations}")
+        lines.append(f'gtm_rbtree_fixup_calls_total{{kind="insert"}} {self.fix_insert[0]}')
+        lines.append(f'gtm_rbtree_fixup_iterations_total{{kind="insert"}} {self.fix_insert[1]}')
+        lines.append(f'gtm_rbtree_fixup_calls_total{{kind="delete"}} {self.fix_delete[0]}')
+        lines.append(f'gtm_rbtree_fixup_iterations_total{{kind="delete"}} {self.fix_delete[1]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Write the metrics to path, as JSON for *.json files and Prometheus text otherwise."""
+        with open(path, 'w') as f:
+            f.write(self.to_json() if path.endswith(".json") else self.to_prometheus())
+
+
+def enable(dump_path=None):
+    """Start collecting metrics and return them; with dump_path they are written at exit."""
+    global metrics
+    metrics = Metrics()
+    MinHeap.probe = metrics
+    ArrayMinHeap.probe = metrics
+    RedBlackTree.probe = metrics
+    if dump_path:
+        atexit.register(metrics.dump, dump_path)
+    return metrics
+
+
+def disable():
+    """Stop collecting metrics; the data structures go back to a single None check per call."""
+    global metrics
+    metrics = None
+    MinHeap.probe = None
+    ArrayMinHeap.probe = None
+    RedBlackTree.probe = None
+
+
+def timed_handlers(handlers):
+    """Wrap command handlers so each call's latency is recorded under its operation name."""
+    active = metrics
+
+    def timed(operation, handler):
+        def run(*args):
+            start = time.perf_counter()
+            try:
+                return handler(*args)
+            finally:
+                active.command(operation, time.perf_counter() - start)
+        return run
+
+    return {operation: timed(operation, handler) for operation, handler in handlers.items()}
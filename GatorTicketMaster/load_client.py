@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import time
+
+from benchmark import generate_workload, percentile
+
+
+async def _open(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _read_response(reader):
+    """Read one response, which ends with an empty line."""
+    lines = []
+    while True:
+        line = await reader.readline()
+        if not line or line == b"\n":
+            return lines
+        lines.append(line)
+
+
+async def run_client(commands, host, port, unix_path, depth):
+    """Send commands over one connection keeping up to depth requests in flight; return latencies."""
+    reader, writer = await _open(host, port, unix_path)
+    sent_at = []
+    latencies = []
+
+    async def receive():
+        for _ in commands:
+            await _read_response(reader)
+            latencies.append(time.perf_counter() - sent_at[len(latencies)])
+            window.release()
+
+    window = asyncio.Semaphore(depth)
+    receiver = asyncio.create_task(receive())
+    for command in commands:
+        await window.acquire()
+        sent_at.append(time.perf_counter())
+        writer.write(command.encode() + b"\n")
+        await writer.drain()
+    await receiver
+    writer.close()
+    await writer.wait_closed()
+    return latencies
+
+
+async def run_load(lines, connections, host, port, unix_path, depth):
+    # Initialize first so every connection works against the same seat pool
+    await run_client(lines[:1], host, port, unix_path, 1)
+    shares = [lines[1 + i::connections] for i in range(connections)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_client(share, host, port, unix_path, depth) for share in shares))
+    return [latency for latencies in results for latency in latencies], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate load against a running ticket_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=32, help="pipelined requests in flight per connection")
+    parser.add_argument("--seats", type=int, default=10000)
+    parser.add_argument("--churn", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lines = generate_workload(args.seats, args.churn, args.seed)
+    latencies, elapsed = asyncio.run(run_load(lines, args.connections, args.host, args.port, args.unix, args.depth))
+    latencies.sort()
+    print(f"{len(latencies)} requests over {args.connections} connections in {elapsed:.3f}s "
+          f"({len(latencies) / elapsed:.0f} req/sec)")
+    print(f"p50 {percentile(latencies, 0.50) * 1e3:.2f} ms, p99 {percentile(latencies, 0.99) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
+from red_black_tree import RedBlackTree
+
+
 class MinHeap:
-    def __init__(self):
+    # remove_range falls back to a full rebuild when at least 1/_REBUILD_FRACTION of the heap goes
+    _REBUILD_FRACTION = 4
+    probe = None  # Metrics receiver set by instrumentation.enable()
+
+    def __init__(self, ordered_index=False):
         self.heap = []
         self.position_map = {}  # Map userID to index for efficient updates
+        # Optional secondary index of userIDs in sorted order, used by remove_range
+        self.user_index = RedBlackTree() if ordered_index else None
 
     def _parent(self, i):
         return (i - 1) // 2
@@ -17,27 +26,85 @@ class MinHeap:
         element = (priority, timestamp, userID)
         self.heap.append(element)
         self.position_map[userID] = len(self.heap) - 1
+        if self.user_index is not None:
+            self.user_index.insert(userID, timestamp)
         self._heapify_up(len(self.heap) - 1)
 
+    @classmethod
+    def from_iterable(cls, entries, ordered_index=False):
+        """Build a heap from (priority, timestamp, userID) tuples in O(n) with a bottom-up heapify."""
+        heap = cls(ordered_index)
+        heap.heap = list(entries)
+        heap.position_map = {userID: i for i, (_, _, userID) in enumerate(heap.heap)}
+        if heap.user_index is not None:
+            heap.user_index.bulk_load(sorted((userID, timestamp) for _, timestamp, userID in heap.heap))
+        heap.heapify()
+        return heap
+
+    def heapify(self):
+        """Restore the heap property over the whole list bottom-up in O(n)."""
+        for i in range(len(self.heap) // 2 - 1, -1, -1):
+            self._heapify_down(i)
+
+    def insert_many(self, entries):
+        """Insert (priority, timestamp, userID) tuples in one batch.
+
+        A batch at least as large as the existing heap is appended and heapified
+        bottom-up in O(n); smaller batches are sifted up one at a time.
+        """
+        entries = list(entries)
+        start = len(self.heap)
+        self.heap.extend(entries)
+        for i in range(start, len(self.heap)):
+            self.position_map[self.heap[i][2]] = i
+        if self.user_index is not None:
+            if self.user_index.is_empty():
+                self.user_index.bulk_load(sorted((userID, timestamp) for _, timestamp, userID in entries))
+            else:
+                for _, timestamp, userID in entries:
+                    self.user_index.insert(userID, timestamp)
+
+        if len(entries) >= start:
+            self.heapify()
+        else:
+            for i in range(start, len(self.heap)):
+                self._heapify_up(i)
+
     def _heapify_up(self, index):
-        """Heapify up to maintain the min-heap property based on (priority, timestamp)."""
-        parent_index = self._parent(index)
-        while index > 0 and self._compare(self.heap[index], self.heap[parent_index]) < 0:
-            # Swap with parent
-            self._swap(index, parent_index)
-            # Move up the heap
+        """Heapify up to maintain the min-heap property based on (priority, timestamp).
+
+        Larger parents are shifted down into a hole that travels up, and the element is
+        written once at its final position instead of being swapped level by level.
+        """
+        heap, positions = self.heap, self.position_map
+        element = heap[index]
+        priority, timestamp = element[0], element[1]
+        start = index
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = heap[parent_index]
+            if priority > parent[0] or (priority == parent[0] and timestamp >= parent[1]):
+                break
+            heap[index] = parent
+            positions[parent[2]] = index
             index = parent_index
-            parent_index = self._parent(index)
+        if index != start:
+            heap[index] = element
+            positions[element[2]] = index
+        if self.probe is not None:
+            self.probe.sift("up", (start + 1).bit_length() - (index + 1).bit_length())
 
     def extract_min(self):
         """Remove and return the smallest element from the heap."""
         if len(self.heap) == 0:
             return None
+        root = self.heap[0]
+        if self.user_index is not None:
+            self.user_index.delete(root[2])
         if len(self.heap) == 1:
-            self.position_map.pop(self.heap[0][2], None)
+            self.position_map.pop(root[2], None)
             return self.heap.pop()
 
-        root = self.heap[0]
         # Move the last element to the root and heapify down
         self.heap[0] = self.heap.pop()
         self.position_map[self.heap[0][2]] = 0
@@ -45,21 +112,59 @@ class MinHeap:
         self._heapify_down(0)
         return root
 
-    def _heapify_down(self, index):
-        """Heapify down to maintain the min-heap property based on (priority, timestamp)."""
-        smallest = index
-        left = self._left(index)
-        right = self._right(index)
+    def extract_many(self, k):
+        """Remove and return the k smallest elements (fewer if the heap runs out) in order.
 
-        if left < len(self.heap) and self._compare(self.heap[left], self.heap[smallest]) < 0:
-            smallest = left
-        if right < len(self.heap) and self._compare(self.heap[right], self.heap[smallest]) < 0:
-            smallest = right
+        When k is a large fraction of the heap the entries are sorted once instead: the
+        prefix is returned and the sorted remainder is already a valid heap.
+        """
+        k = min(k, len(self.heap))
+        if k * self._REBUILD_FRACTION < len(self.heap):
+            return [self.extract_min() for _ in range(k)]
+        ordered = sorted(self.heap)
+        popped = ordered[:k]
+        self.heap = ordered[k:]
+        self.position_map = {userID: i for i, (_, _, userID) in enumerate(self.heap)}
+        if self.user_index is not None:
+            if len(self.heap) < k:
+                self.user_index = RedBlackTree()
+                self.user_index.bulk_load(sorted((userID, timestamp) for _, timestamp, userID in self.heap))
+            else:
+                for _, _, userID in popped:
+                    self.user_index.delete(userID)
+        return popped
 
-        # If the smallest is not the current index, swap and continue heapifying down
-        if smallest != index:
-            self._swap(index, smallest)
-            self._heapify_down(smallest)
+    def _heapify_down(self, index):
+        """Heapify down to maintain the min-heap property based on (priority, timestamp).
+
+        Iterative: smaller children are shifted up into a hole that travels down, and the
+        element is written once at its final position.
+        """
+        heap, positions = self.heap, self.position_map
+        size = len(heap)
+        element = heap[index]
+        priority, timestamp = element[0], element[1]
+        start = index
+        while True:
+            child_index = 2 * index + 1
+            if child_index >= size:
+                break
+            child = heap[child_index]
+            if child_index + 1 < size:
+                right = heap[child_index + 1]
+                if right[0] < child[0] or (right[0] == child[0] and right[1] < child[1]):
+                    child_index += 1
+                    child = right
+            if priority < child[0] or (priority == child[0] and timestamp <= child[1]):
+                break
+            heap[index] = child
+            positions[child[2]] = index
+            index = child_index
+        if index != start:
+            heap[index] = element
+            positions[element[2]] = index
+        if self.probe is not None:
+            self.probe.sift("down", (index + 1).bit_length() - (start + 1).bit_length())
 
     def _compare(self, a, b):
         """Comparison method for tuples (priority, timestamp, userID)."""
@@ -76,6 +181,10 @@ class MinHeap:
                 return 1
             return 0  # Equal priority and timestamp
 
+    def entries(self):
+        """Return the entries as (priority, timestamp, userID) tuples in heap order."""
+        return list(self.heap)
+
     def is_empty(self):
         """Check if the heap is empty."""
         return len(self.heap) == 0
@@ -84,38 +193,75 @@ class MinHeap:
         """Return the current number of elements in the heap."""
         return len(self.heap)
 
-    def _swap(self, i, j):
-        """Swap elements at index i and j in the heap and update position_map."""
-        self.position_map[self.heap[i][2]] = j
-        self.position_map[self.heap[j][2]] = i
-        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+    def contains(self, userID):
+        """Check if the given userID is in the heap."""
+        return userID in self.position_map
+
+    def delete(self, userID):
+        """Remove the entry for userID and return it, or None if the user is not in the heap."""
+        index = self.position_map.pop(userID, None)
+        if index is None:
+            return None
+        if self.user_index is not None:
+            self.user_index.delete(userID)
+        return self._remove_at(index)
+
+    def _remove_at(self, index):
+        """Remove the element at index, whose position_map entry is already gone, and return it."""
+        element = self.heap[index]
+        last = self.heap.pop()
+        if index < len(self.heap):
+            # Move the last element into the hole and sift it in whichever direction is needed
+            self.heap[index] = last
+            self.position_map[last[2]] = index
+            if index > 0 and self._compare(last, self.heap[self._parent(index)]) < 0:
+                self._heapify_up(index)
+            else:
+                self._heapify_down(index)
+        return element
 
     def update_priority(self, userID, new_priority):
-        """Update the priority of a user in the waitlist."""
+        """Update the priority of a user in the heap, keeping the original timestamp.
+
+        Returns True if the user was found in the heap, False otherwise.
+        """
         if userID not in self.position_map:
-            print(f"User {userID} priority is not updated")
-            return
+            return False
 
         index = self.position_map[userID]
         current_priority, timestamp, _ = self.heap[index]
         # Update only if the new priority is different
         if new_priority != current_priority:
             self.heap[index] = (new_priority, timestamp, userID)
-            # Decide to heapify up or down based on the new priority
+            # Decrease-key sifts up, increase-key sifts down
             if new_priority < current_priority:
                 self._heapify_up(index)
             else:
                 self._heapify_down(index)
-            print(f"User {userID} priority has been updated to {new_priority}")
+        return True
 
     def remove_range(self, userID1, userID2):
-        """Remove all entries with userID in the range [userID1, userID2]."""
-        # Filter out entries within the range and keep others
-        self.heap = [item for item in self.heap if not (userID1 <= item[2] <= userID2)]
-        # Rebuild the position map and re-heapify
-        self.position_map = {userID: i for i, (_, _, userID) in enumerate(self.heap)}
-        # Heapify the entire structure
-        for i in range(len(self.heap) // 2, -1, -1):
-            self._heapify_down(i)
-        print(f"Users in range [{userID1}, {userID2}] have been removed from the heap.")
+        """Remove all entries with userID in the range [userID1, userID2] and return them.
 
+        With an ordered index the affected users are found in O(log n + k) and removed
+        with indexed deletes; the whole heap is only rebuilt when k is a large fraction of n.
+        """
+        if self.user_index is None:
+            removed = [item for item in self.heap if userID1 <= item[2] <= userID2]
+            if removed:
+                self._rebuild([item for item in self.heap if not (userID1 <= item[2] <= userID2)])
+            return removed
+
+        users = [userID for userID, _ in self.user_index.delete_range(userID1, userID2)]
+        if len(users) * self._REBUILD_FRACTION < len(self.heap):
+            return [self._remove_at(self.position_map.pop(userID)) for userID in users]
+
+        removed = [self.heap[self.position_map[userID]] for userID in users]
+        self._rebuild([item for item in self.heap if not (userID1 <= item[2] <= userID2)])
+        return removed
+
+    def _rebuild(self, items):
+        """Replace the heap contents with items and restore the heap property bottom-up."""
+        self.heap = items
+        self.position_map = {userID: i for i, (_, _, userID) in enumerate(self.heap)}
+        self.heapify()
@@ -0,0 +1,114 @@
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from gatorTicketMaster import GatorTicketMaster, COMMANDS, parse_command
+from output_sink import MemorySink
+
+# <eventID>:<Operation(args)>, e.g. "concert7: Reserve(12, 3)"
+EVENT_PATTERN = re.compile(r"\s*([^\s:]+)\s*:(.*)$")
+
+
+def read_events(input_file):
+    """Group the input lines by event ID.
+
+    Returns ({event_id: [(line_number, command), ...]}, errors) where errors lists
+    (line_number, message) for lines without an event prefix.
+    """
+    events = {}
+    errors = []
+    with open(input_file, 'r') as file:
+        for line_number, line in enumerate(file, 1):
+            match = EVENT_PATTERN.match(line)
+            if match is None:
+                if line.strip():
+                    errors.append((line_number, f"missing event ID: {line.strip()}"))
+                continue
+            event_id, command = match.groups()
+            events.setdefault(event_id, []).append((line_number, command))
+    return events, errors
+
+
+def assign_events(events, workers):
+    """Split events into at most `workers` shards with similar command counts, deterministically."""
+    shards = [[] for _ in range(max(1, workers))]
+    loads = [0] * len(shards)
+    # Largest events first onto the least loaded shard; ties broken by event ID
+    for event_id in sorted(events, key=lambda e: (-len(events[e]), e)):
+        target = min(range(len(shards)), key=lambda i: (loads[i], i))
+        shards[target].append((event_id, events[event_id]))
+        loads[target] += len(events[event_id])
+    return [shard for shard in shards if shard]
+
+
+def run_shard(shard):
+    """Run every event of a shard on its own GatorTicketMaster.
+
+    Returns (results, errors): results holds (line_number, event_id, output lines) per
+    command, and errors holds (line_number, message) for malformed commands.
+    """
+    results = []
+    errors = []
+    for event_id, commands in shard:
+        system = GatorTicketMaster(None, sink=MemorySink())
+        handlers = {operation: getattr(system, method) for operation, (method, _) in COMMANDS.items()}
+        for line_number, line in commands:
+            try:
+                command = parse_command(line)
+            except ValueError as error:
+                errors.append((line_number, f"{event_id}: {error}"))
+                continue
+            if command is None:
+                continue
+            operation, args = command
+            if system.holds:
+                system.expire_holds()  # Expiry output is reported with the command that noticed it
+            handlers[operation](*args)
+            results.append((line_number, event_id, system.sink.lines))
+            system.sink.lines = []
+            if operation == "Quit":
+                break  # Later commands for this event are not processed
+    return results, errors
+
+
+def process_events(input_file, workers=None):
+    """Process a multi-event input file across a process pool and write the merged output.
+
+    Output lines are prefixed with their event ID and merged in input order, so the
+    result does not depend on the number of workers.
+    """
+    input_filename_without_ext = os.path.splitext(input_file)[0]
+    output_file = f"{input_filename_without_ext}_output_file.txt"
+
+    events, errors = read_events(input_file)
+    shards = assign_events(events, workers or os.cpu_count() or 1)
+    results = []
+    if len(shards) == 1:
+        shard_results = [run_shard(shards[0])]  # Not worth a process pool
+    else:
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            shard_results = list(pool.map(run_shard, shards))
+    for shard_result, shard_errors in shard_results:
+        results.extend(shard_result)
+        errors.extend(shard_errors)
+
+    for line_number, message in sorted(errors):
+        print(f"{input_file}:{line_number}: {message}", file=sys.stderr)
+
+    results.sort(key=lambda result: result[0])
+    with open(output_file, 'w') as f:
+        f.write("\n".join(f"{event_id}: {line}"
+                          for _, event_id, messages in results
+                          for message in messages
+                          for line in message.split("\n")))
+    return output_file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process commands for many events in parallel")
+    parser.add_argument("input_file", help="file with one <eventID>:<Command> per line")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    process_events(args.input_file, args.workers)
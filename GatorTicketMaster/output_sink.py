@@ -0,0 +1,56 @@
+class FileSink:
+    """Buffered writer that streams output lines to a file in chunks.
+
+    Lines are separated by newlines with no trailing newline, matching the
+    expected output files.
+    """
+
+    def __init__(self, output_file, chunk_lines=4096):
+        self.file = open(output_file, 'w')
+        self.chunk_lines = chunk_lines
+        self.buffer = []
+        self.started = False  # Whether anything has been written to the file yet
+
+    def write(self, message):
+        self.buffer.append(message)
+        if len(self.buffer) >= self.chunk_lines:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered lines to the file."""
+        if self.buffer and self.file is not None:
+            if self.started:
+                self.file.write("\n")
+            self.file.write("\n".join(self.buffer))
+            self.started = True
+            self.buffer.clear()
+
+    def close(self):
+        """Flush the remaining lines and close the file; safe to call more than once."""
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+
+class MemorySink:
+    """Keeps every output line in memory, for callers that need the lines back."""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, message):
+        self.lines.append(message)
+
+    def close(self):
+        pass
+
+
+class NullSink:
+    """Discards all output, for benchmarking the data structures alone."""
+
+    def write(self, message):
+        pass
+
+    def close(self):
+        pass
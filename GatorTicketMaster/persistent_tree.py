@@ -0,0 +1,257 @@
+from red_black_tree import RED, BLACK
+
+
+class _Node:
+    # Nodes are never modified after construction, so any root stays a valid snapshot
+    __slots__ = ("color", "left", "key", "value", "right", "size")
+
+    def __init__(self, color, left, key, value, right):
+        self.color = color
+        self.left = left  # None for an empty subtree
+        self.key = key
+        self.value = value
+        self.right = right
+        size = 1
+        if left is not None:
+            size += left.size
+        if right is not None:
+            size += right.size
+        self.size = size
+
+
+def _is_red(node):
+    return node is not None and node.color == RED
+
+
+def _is_black(node):
+    return node is not None and node.color == BLACK
+
+
+def _recolor(node, color):
+    if node.color == color:
+        return node
+    return _Node(color, node.left, node.key, node.value, node.right)
+
+
+def _balance(left, key, value, right):
+    """Build a black node, rotating away a red child with a red child of its own."""
+    if _is_red(left) and _is_red(right):
+        return _Node(RED, _recolor(left, BLACK), key, value, _recolor(right, BLACK))
+    if _is_red(left):
+        if _is_red(left.left):
+            a = left.left
+            return _Node(RED, _recolor(a, BLACK), left.key, left.value, _Node(BLACK, left.right, key, value, right))
+        if _is_red(left.right):
+            b = left.right
+            return _Node(RED, _Node(BLACK, left.left, left.key, left.value, b.left), b.key, b.value,
+                         _Node(BLACK, b.right, key, value, right))
+    if _is_red(right):
+        if _is_red(right.right):
+            c = right.right
+            return _Node(RED, _Node(BLACK, left, key, value, right.left), right.key, right.value, _recolor(c, BLACK))
+        if _is_red(right.left):
+            b = right.left
+            return _Node(RED, _Node(BLACK, left, key, value, b.left), b.key, b.value,
+                         _Node(BLACK, b.right, right.key, right.value, right.right))
+    return _Node(BLACK, left, key, value, right)
+
+
+def _insert(node, key, value):
+    if node is None:
+        return _Node(RED, None, key, value, None)
+    if key < node.key:
+        left = _insert(node.left, key, value)
+        if node.color == BLACK and left.color == RED:
+            return _balance(left, node.key, node.value, node.right)
+        return _Node(node.color, left, node.key, node.value, node.right)
+    if key > node.key:
+        right = _insert(node.right, key, value)
+        if node.color == BLACK and right.color == RED:
+            return _balance(node.left, node.key, node.value, right)
+        return _Node(node.color, node.left, node.key, node.value, right)
+    return _Node(node.color, node.left, key, value, node.right)  # Existing key: replace the value
+
+
+# Deletion follows Kahrs, "Red-black trees with types" (JFP 2001). The _balance_left/_right
+# helpers repair a subtree whose black height dropped by one on that side.
+
+def _balance_left(left, key, value, right):
+    if _is_red(left):
+        return _Node(RED, _recolor(left, BLACK), key, value, right)
+    if _is_black(right):
+        return _balance(left, key, value, _recolor(right, RED))
+    # right is red with a black left child
+    a = right.left
+    return _Node(RED, _Node(BLACK, left, key, value, a.left), a.key, a.value,
+                 _balance(a.right, right.key, right.value, _recolor(right.right, RED)))
+
+
+def _balance_right(left, key, value, right):
+    if _is_red(right):
+        return _Node(RED, left, key, value, _recolor(right, BLACK))
+    if _is_black(left):
+        return _balance(_recolor(left, RED), key, value, right)
+    # left is red with a black right child
+    b = left.right
+    return _Node(RED, _balance(_recolor(left.left, RED), left.key, left.value, b.left), b.key, b.value,
+                 _Node(BLACK, b.right, key, value, right))
+
+
+def _join(left, right):
+    """Join the two subtrees of a deleted node, every key of left being smaller than every key of right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if _is_red(left) and _is_red(right):
+        middle = _join(left.right, right.left)
+        if _is_red(middle):
+            return _Node(RED, _Node(RED, left.left, left.key, left.value, middle.left), middle.key, middle.value,
+                         _Node(RED, middle.right, right.key, right.value, right.right))
+        return _Node(RED, left.left, left.key, left.value, _Node(RED, middle, right.key, right.value, right.right))
+    if _is_black(left) and _is_black(right):
+        middle = _join(left.right, right.left)
+        if _is_red(middle):
+            return _Node(RED, _Node(BLACK, left.left, left.key, left.value, middle.left), middle.key, middle.value,
+                         _Node(BLACK, middle.right, right.key, right.value, right.right))
+        return _balance_left(left.left, left.key, left.value, _Node(BLACK, middle, right.key, right.value, right.right))
+    if _is_red(right):
+        return _Node(RED, _join(left, right.left), right.key, right.value, right.right)
+    return _Node(RED, left.left, left.key, left.value, _join(left.right, right))
+
+
+def _delete(node, key):
+    if node is None:
+        return None
+    if key < node.key:
+        if _is_black(node.left):
+            return _balance_left(_delete(node.left, key), node.key, node.value, node.right)
+        return _Node(RED, _delete(node.left, key), node.key, node.value, node.right)
+    if key > node.key:
+        if _is_black(node.right):
+            return _balance_right(node.left, node.key, node.value, _delete(node.right, key))
+        return _Node(RED, node.left, node.key, node.value, _delete(node.right, key))
+    return _join(node.left, node.right)
+
+
+class PersistentRedBlackTree:
+    """Red-Black Tree whose updates copy the search path instead of modifying nodes.
+
+    Every insert or delete builds O(log n) new nodes and swaps in a new root, so a root
+    taken earlier (see snapshot) keeps describing the tree as it was and can be read
+    from other threads while the writer carries on. It offers the RedBlackTree methods
+    GatorTicketMaster uses on seat_index, and can replace it there.
+    """
+
+    def __init__(self, root=None):
+        self.root = root
+
+    def __len__(self):
+        return self.root.size if self.root is not None else 0
+
+    def snapshot(self):
+        """Return an independent tree holding the current contents, in O(1)."""
+        return PersistentRedBlackTree(self.root)
+
+    def is_empty(self):
+        return self.root is None
+
+    def search(self, key):
+        """Return the value stored under key, or None if the key is absent."""
+        node = self.root
+        while node is not None:
+            if key == node.key:
+                return node.value
+            node = node.left if key < node.key else node.right
+        return None
+
+    def contains(self, key):
+        node = self.root
+        while node is not None and key != node.key:
+            node = node.left if key < node.key else node.right
+        return node is not None
+
+    def insert(self, key, value):
+        """Insert key with value, replacing the value if the key is already present."""
+        self.root = _recolor(_insert(self.root, key, value), BLACK)
+
+    def delete(self, key):
+        """Delete key if it is present."""
+        if not self.contains(key):
+            return  # Avoid copying the search path for nothing
+        root = _delete(self.root, key)
+        self.root = _recolor(root, BLACK) if root is not None else None
+
+    def bulk_load(self, items):
+        """Build the tree from (key, value) pairs sorted by key with unique keys, in O(n)."""
+        if not self.is_empty():
+            raise ValueError("bulk_load requires an empty tree")
+        items = list(items)
+        red_depth = len(items).bit_length() - 1  # Deepest level is red, as in RedBlackTree.bulk_load
+
+        def build(lo, hi, depth):
+            if lo > hi:
+                return None
+            mid = (lo + hi) // 2
+            left = build(lo, mid - 1, depth + 1)
+            right = build(mid + 1, hi, depth + 1)
+            return _Node(RED if depth == red_depth and depth > 0 else BLACK, left, items[mid][0], items[mid][1], right)
+
+        self.root = build(0, len(items) - 1, 0)
+
+    def items(self):
+        """Yield (key, value) pairs in ascending key order."""
+        return self.range_items(None, None)
+
+    def range_items(self, low, high):
+        """Yield (key, value) pairs with low <= key <= high in ascending key order; None leaves a side open."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if low is not None and node.key < low:
+                    node = node.right  # Everything on the left is below the range
+                    continue
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if high is not None and node.key > high:
+                return
+            yield node.key, node.value
+            node = node.right
+
+    def rank(self, key):
+        """Return the number of keys smaller than key."""
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                count += (node.left.size if node.left is not None else 0) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def select(self, k):
+        """Return the (key, value) pair with the k-th smallest key (0-based), or None if k is out of range."""
+        if not 0 <= k < len(self):
+            return None
+        node = self.root
+        while True:
+            left_size = node.left.size if node.left is not None else 0
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.key, node.value
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def count_range(self, low, high):
+        """Return the number of keys with low <= key <= high."""
+        if low > high:
+            return 0
+        count = self.rank(high) - self.rank(low)
+        return count + 1 if self.contains(high) else count
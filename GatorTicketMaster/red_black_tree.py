@@ -1,17 +1,31 @@
+RED = 0
+BLACK = 1
+
+
 class RedBlackTree:
     class Node:
-        def __init__(self, key, value, color="RED", parent=None, left=None, right=None):
+        # __slots__ drops the per-node __dict__, which dominates memory with millions of reservations
+        __slots__ = ("key", "value", "color", "parent", "left", "right", "size")
+
+        def __init__(self, key, value, color=RED, parent=None, left=None, right=None, size=1):
             self.key = key  # user_id
             self.value = value  # seat_id
             self.color = color
             self.parent = parent
             self.left = left
             self.right = right
+            self.size = size  # Number of nodes in the subtree rooted here, for rank/select
+
+    probe = None  # Metrics receiver set by instrumentation.enable()
 
     def __init__(self):
-        self.NIL_LEAF = self.Node(key=None, value=None, color="BLACK")  # Sentinel node (for leaves)
+        self.NIL_LEAF = self.Node(key=None, value=None, color=BLACK, size=0)  # Sentinel node (for leaves)
         self.root = self.NIL_LEAF
 
+    def __len__(self):
+        """Return the number of nodes in O(1) from the root's subtree size."""
+        return self.root.size
+
     def is_empty(self):
         """Check if the Red-Black Tree is empty."""
         return self.root == self.NIL_LEAF
@@ -30,14 +44,11 @@ class RedBlackTree:
         return self._search(self.root, key)
 
     def _search(self, node, key):
-        if node == self.NIL_LEAF or node.key is None:
-            return None  # Not found
-        if key == node.key:
-            return node.value  # Return seat_id
-        elif key < node.key:
-            return self._search(node.left, key)
-        else:
-            return self._search(node.right, key)
+        while node is not self.NIL_LEAF:
+            if key == node.key:
+                return node.value  # Return seat_id
+            node = node.left if key < node.key else node.right
+        return None  # Not found
 
     def insert(self, key, value):
         """Insert a new node with the given key (user_id) and value (seat_id)."""
@@ -45,9 +56,10 @@ class RedBlackTree:
         parent = None
         current = self.root
 
-        # Binary Search Tree insert logic
+        # Binary Search Tree insert logic; every node on the path gains one descendant
         while current != self.NIL_LEAF:
             parent = current
+            current.size += 1
             if new_node.key < current.key:
                 current = current.left
             else:
@@ -62,48 +74,80 @@ class RedBlackTree:
         else:
             parent.right = new_node
 
-        new_node.color = "RED"
+        new_node.color = RED
         self._fix_insert(new_node)
 
+    def bulk_load(self, items):
+        """Build the tree from (key, value) pairs sorted by key with unique keys, in O(n).
+
+        The tree must be empty. Midpoints become subtree roots, so every level but the
+        deepest is full; coloring the deepest level red keeps all black-heights equal.
+        """
+        if not self.is_empty():
+            raise ValueError("bulk_load requires an empty tree")
+        items = list(items)
+        if not items:
+            return
+        red_depth = len(items).bit_length() - 1  # Depth of the deepest level
+
+        def build(lo, hi, depth, parent):
+            if lo > hi:
+                return self.NIL_LEAF
+            mid = (lo + hi) // 2
+            key, value = items[mid]
+            node = self.Node(key, value, RED if depth == red_depth else BLACK, parent, size=hi - lo + 1)
+            node.left = build(lo, mid - 1, depth + 1, node)
+            node.right = build(mid + 1, hi, depth + 1, node)
+            return node
+
+        self.root = build(0, len(items) - 1, 0, None)
+        self.root.color = BLACK
+
     def _fix_insert(self, node):
         """Fix the Red-Black Tree after an insertion to maintain the properties."""
-        while node != self.root and node.parent.color == "RED":
+        iterations = 0
+        while node != self.root and node.parent.color == RED:
+            iterations += 1
             if node.parent == node.parent.parent.left:
                 uncle = node.parent.parent.right
-                if uncle.color == "RED":
+                if uncle.color == RED:
                     # Case 1: Uncle is red
-                    node.parent.color = "BLACK"
-                    uncle.color = "BLACK"
-                    node.parent.parent.color = "RED"
+                    node.parent.color = BLACK
+                    uncle.color = BLACK
+                    node.parent.parent.color = RED
                     node = node.parent.parent
                 else:
                     # Case 2 and 3: Uncle is black
                     if node == node.parent.right:
                         node = node.parent
                         self._rotate_left(node)
-                    node.parent.color = "BLACK"
-                    node.parent.parent.color = "RED"
+                    node.parent.color = BLACK
+                    node.parent.parent.color = RED
                     self._rotate_right(node.parent.parent)
             else:
                 uncle = node.parent.parent.left
-                if uncle.color == "RED":
+                if uncle.color == RED:
                     # Case 1: Uncle is red
-                    node.parent.color = "BLACK"
-                    uncle.color = "BLACK"
-                    node.parent.parent.color = "RED"
+                    node.parent.color = BLACK
+                    uncle.color = BLACK
+                    node.parent.parent.color = RED
                     node = node.parent.parent
                 else:
                     # Case 2 and 3: Uncle is black
                     if node == node.parent.left:
                         node = node.parent
                         self._rotate_right(node)
-                    node.parent.color = "BLACK"
-                    node.parent.parent.color = "RED"
+                    node.parent.color = BLACK
+                    node.parent.parent.color = RED
                     self._rotate_left(node.parent.parent)
-        self.root.color = "BLACK"
+        self.root.color = BLACK
+        if self.probe is not None:
+            self.probe.fixup("insert", iterations)
 
     def _rotate_left(self, node):
         """Rotate the node to the left."""
+        if self.probe is not None:
+            self.probe.rotation()
         y = node.right
         node.right = y.left
         if y.left != self.NIL_LEAF:
@@ -117,9 +161,13 @@ class RedBlackTree:
             node.parent.right = y
         y.left = node
         node.parent = y
+        y.size = node.size
+        node.size = node.left.size + node.right.size + 1
 
     def _rotate_right(self, node):
         """Rotate the node to the right."""
+        if self.probe is not None:
+            self.probe.rotation()
         y = node.left
         node.left = y.right
         if y.right != self.NIL_LEAF:
@@ -133,19 +181,114 @@ class RedBlackTree:
             node.parent.left = y
         y.right = node
         node.parent = y
+        y.size = node.size
+        node.size = node.left.size + node.right.size + 1
 
     def delete(self, key):
         """Delete the node with the given key (user_id) from the Red-Black Tree."""
         node = self._search_node(self.root, key)
         if node == self.NIL_LEAF or node.key is None:
             return  # Node to be deleted does not exist
+        self._delete_node(node)
+
+    def range_items(self, low, high):
+        """Yield (key, value) pairs with low <= key <= high in ascending key order; None leaves a side open."""
+        if low is not None:
+            node = self._lower_bound(low)
+        else:
+            node = None if self.is_empty() else self._minimum(self.root)
+        while node is not None and (high is None or node.key <= high):
+            yield node.key, node.value
+            node = self._successor(node)
+
+    def delete_range(self, low, high):
+        """Delete every node with low <= key <= high and return the removed (key, value) pairs.
+
+        Seeks to the lower bound once and walks successors, so the scan costs
+        O(log n + k) for k matching keys instead of one probe per key in the range.
+        """
+        nodes = []
+        node = self._lower_bound(low)
+        while node is not None and node.key <= high:
+            nodes.append(node)
+            node = self._successor(node)
+
+        # Deletion relinks nodes rather than copying keys, so the collected nodes stay valid
+        removed = []
+        for node in nodes:
+            removed.append((node.key, node.value))
+            self._delete_node(node)
+        return removed
+
+    def rank(self, key):
+        """Return the number of keys smaller than key, in O(log n)."""
+        return self._count_below(key, False)
+
+    def select(self, k):
+        """Return the (key, value) pair with the k-th smallest key (0-based), or None if k is out of range."""
+        if not 0 <= k < self.root.size:
+            return None
+        node = self.root
+        while True:
+            left_size = node.left.size
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.key, node.value
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def count_range(self, low, high):
+        """Return the number of keys with low <= key <= high, in O(log n)."""
+        if low > high:
+            return 0
+        return self._count_below(high, True) - self._count_below(low, False)
+
+    def _count_below(self, key, inclusive):
+        """Count the keys smaller than key, or smaller than or equal to it when inclusive."""
+        count = 0
+        node = self.root
+        while node is not self.NIL_LEAF:
+            if node.key < key or (inclusive and node.key == key):
+                count += node.left.size + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def _lower_bound(self, key):
+        """Return the node with the smallest key >= key, or None if there is none."""
+        result = None
+        current = self.root
+        while current != self.NIL_LEAF:
+            if current.key < key:
+                current = current.right
+            else:
+                result = current
+                current = current.left
+        return result
 
+    def _successor(self, node):
+        """Return the in-order successor of node, or None if node holds the largest key."""
+        if node.right != self.NIL_LEAF:
+            return self._minimum(node.right)
+        parent = node.parent
+        while parent is not None and node == parent.right:
+            node = parent
+            parent = parent.parent
+        return parent
+
+    def _delete_node(self, node):
+        """Unlink the given node from the tree and rebalance."""
         y_original_color = node.color
         if node.left == self.NIL_LEAF:
             x = node.right
+            shrunk = node.parent  # Lowest node whose subtree lost a node
             self._transplant(node, node.right)
         elif node.right == self.NIL_LEAF:
             x = node.left
+            shrunk = node.parent
             self._transplant(node, node.left)
         else:
             y = self._minimum(node.right)
@@ -153,7 +296,9 @@ class RedBlackTree:
             x = y.right
             if y.parent == node:
                 x.parent = y
+                shrunk = y
             else:
+                shrunk = y.parent
                 self._transplant(y, y.right)
                 y.right = node.right
                 y.right.parent = y
@@ -161,56 +306,65 @@ class RedBlackTree:
             y.left = node.left
             y.left.parent = y
             y.color = node.color
+            y.size = node.size  # Decremented with the rest of the path below
+
+        while shrunk is not None:
+            shrunk.size -= 1
+            shrunk = shrunk.parent
 
-        if y_original_color == "BLACK":
+        if y_original_color == BLACK:
             self._fix_delete(x)
 
     def _fix_delete(self, x):
         """Fix the Red-Black Tree after a deletion to maintain the properties."""
-        while x != self.root and x.color == "BLACK":
+        iterations = 0
+        while x != self.root and x.color == BLACK:
+            iterations += 1
             if x == x.parent.left:
                 sibling = x.parent.right
-                if sibling.color == "RED":
-                    sibling.color = "BLACK"
-                    x.parent.color = "RED"
+                if sibling.color == RED:
+                    sibling.color = BLACK
+                    x.parent.color = RED
                     self._rotate_left(x.parent)
                     sibling = x.parent.right
-                if sibling.left.color == "BLACK" and sibling.right.color == "BLACK":
-                    sibling.color = "RED"
+                if sibling.left.color == BLACK and sibling.right.color == BLACK:
+                    sibling.color = RED
                     x = x.parent
                 else:
-                    if sibling.right.color == "BLACK":
-                        sibling.left.color = "BLACK"
-                        sibling.color = "RED"
+                    if sibling.right.color == BLACK:
+                        sibling.left.color = BLACK
+                        sibling.color = RED
                         self._rotate_right(sibling)
                         sibling = x.parent.right
                     sibling.color = x.parent.color
-                    x.parent.color = "BLACK"
-                    sibling.right.color = "BLACK"
+                    x.parent.color = BLACK
+                    sibling.right.color = BLACK
                     self._rotate_left(x.parent)
                     x = self.root
             else:
                 sibling = x.parent.left
-                if sibling.color == "RED":
-                    sibling.color = "BLACK"
-                    x.parent.color = "RED"
+                if sibling.color == RED:
+                    sibling.color = BLACK
+                    x.parent.color = RED
                     self._rotate_right(x.parent)
                     sibling = x.parent.left
-                if sibling.right.color == "BLACK" and sibling.left.color == "BLACK":
-                    sibling.color = "RED"
+                if sibling.right.color == BLACK and sibling.left.color == BLACK:
+                    sibling.color = RED
                     x = x.parent
                 else:
-                    if sibling.left.color == "BLACK":
-                        sibling.right.color = "BLACK"
-                        sibling.color = "RED"
+                    if sibling.left.color == BLACK:
+                        sibling.right.color = BLACK
+                        sibling.color = RED
                         self._rotate_left(sibling)
                         sibling = x.parent.left
                     sibling.color = x.parent.color
-                    x.parent.color = "BLACK"
-                    sibling.left.color = "BLACK"
+                    x.parent.color = BLACK
+                    sibling.left.color = BLACK
                     self._rotate_right(x.parent)
                     x = self.root
-        x.color = "BLACK"
+        x.color = BLACK
+        if self.probe is not None:
+            self.probe.fixup("delete", iterations)
 
     def _minimum(self, node):
         """Find the minimum value node starting from the given node."""
@@ -230,26 +384,13 @@ class RedBlackTree:
 
     def _search_node(self, node, key):
         """Search for a node by its key (user_id)."""
-        if node == self.NIL_LEAF or key == node.key:
-            return node
-        if key < node.key:
-            return self._search_node(node.left, key)
-        else:
-            return self._search_node(node.right, key)
+        while node is not self.NIL_LEAF and key != node.key:
+            node = node.left if key < node.key else node.right
+        return node
 
     def inorder(self):
         """Inorder traversal of the Red-Black Tree and returns the reservations as a list of tuples."""
-        result = []
-
-        def _inorder_helper(node):
-            if node != self.NIL_LEAF:
-                _inorder_helper(node.left)
-                result.append((node.value, node.key))  # Append (seat_id, user_id)
-                _inorder_helper(node.right)
-
-        _inorder_helper(self.root)
-        return result  # Return the list of (seat_id, user_id) tuples
-
+        return self.in_order_traversal()  # Return the list of (seat_id, user_id) tuples
 
     def contains(self, user_id):
         """Check if the tree contains the given user_id."""
@@ -258,13 +399,21 @@ class RedBlackTree:
 
     def in_order_traversal(self):
         """Perform an in-order traversal and return a list of (seatID, userID) pairs."""
-        results = []
-        self._in_order_helper(self.root, results)
-        return results
-
-    def _in_order_helper(self, node, results):
-        """Recursive helper for in-order traversal."""
-        if node != self.NIL_LEAF:
-            self._in_order_helper(node.left, results)
-            results.append((node.value, node.key))  # Collect (seatID, userID) pairs
-            self._in_order_helper(node.right, results)
+        return [(node.value, node.key) for node in self._in_order_nodes()]
+
+    def items(self):
+        """Yield (key, value) pairs in ascending key order."""
+        for node in self._in_order_nodes():
+            yield node.key, node.value
+
+    def _in_order_nodes(self):
+        """Yield the nodes in ascending key order using an explicit stack instead of recursion."""
+        stack = []
+        node = self.root
+        while stack or node is not self.NIL_LEAF:
+            while node is not self.NIL_LEAF:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
@@ -0,0 +1,149 @@
+from bisect import bisect_right
+
+
+class SeatPool:
+    """Pool of unassigned seats stored as sorted runs of contiguous seat numbers.
+
+    Runs are kept in two parallel ascending lists of inclusive bounds. Runs before
+    `head` have already been handed out, so taking the lowest seat never shifts the
+    lists; the consumed prefix is compacted away once it dominates the lists.
+    """
+
+    _COMPACT_THRESHOLD = 64
+    # merge_sorted inserts seats one by one while there are _MERGE_FACTOR times more runs than seats
+    _MERGE_FACTOR = 8
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.head = 0  # Index of the run holding the lowest free seat
+        self.count = 0  # Number of free seats across all runs
+
+    def is_empty(self):
+        """Check if there are no free seats."""
+        return self.count == 0
+
+    def size(self):
+        """Return the number of free seats."""
+        return self.count
+
+    def runs(self):
+        """Return the free seats as a list of (start, end) inclusive ranges in ascending order."""
+        return list(zip(self.starts[self.head:], self.ends[self.head:]))
+
+    def extract_min(self):
+        """Remove and return the lowest-numbered free seat, or None if there is none."""
+        if self.count == 0:
+            return None
+        head = self.head
+        seat = self.starts[head]
+        if seat == self.ends[head]:
+            # Run exhausted, move the cursor to the next one
+            self.head = head + 1
+            self._compact()
+        else:
+            self.starts[head] = seat + 1
+        self.count -= 1
+        return seat
+
+    def extract_many(self, k):
+        """Remove and return the k lowest-numbered free seats (fewer if the pool runs out) in one pass."""
+        seats = []
+        starts, ends = self.starts, self.ends
+        head = self.head
+        while k > 0 and head < len(starts):
+            start, end = starts[head], ends[head]
+            take = min(k, end - start + 1)
+            seats.extend(range(start, start + take))
+            k -= take
+            if start + take > end:
+                head += 1
+            else:
+                starts[head] = start + take
+        self.head = head
+        self.count -= len(seats)
+        self._compact()
+        return seats
+
+    def add_range(self, start, end):
+        """Add the seats start..end (inclusive), merging with the adjacent runs."""
+        if start > end:
+            return
+        if self.head == len(self.starts) or start > self.ends[-1] + 1:
+            # Common case for Initialize/AddSeats: the new seats follow every free seat
+            self.starts.append(start)
+            self.ends.append(end)
+            self.count += end - start + 1
+        elif start == self.ends[-1] + 1:
+            self.ends[-1] = end
+            self.count += end - start + 1
+        else:
+            for seat in range(start, end + 1):
+                self.insert(seat)
+
+    def merge_sorted(self, seats):
+        """Return ascending, currently unassigned seats to the pool.
+
+        A handful of seats are inserted one by one; larger batches are merged with the
+        existing runs in a single linear pass that coalesces adjacent seats into runs.
+        """
+        if not seats:
+            return
+        if len(seats) * self._MERGE_FACTOR < len(self.starts) - self.head:
+            for seat in seats:
+                self.insert(seat)
+            return
+
+        starts, ends = [], []
+        old_starts, old_ends = self.starts, self.ends
+        i, n = self.head, len(old_starts)
+        j, k = 0, len(seats)
+        while i < n or j < k:
+            # Take whichever of the next run and the next seat starts first
+            if j == k or (i < n and old_starts[i] < seats[j]):
+                start, end = old_starts[i], old_ends[i]
+                i += 1
+            else:
+                start = end = seats[j]
+                j += 1
+            if ends and ends[-1] + 1 >= start:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        self.starts, self.ends = starts, ends
+        self.head = 0
+        self.count += k
+
+    def insert(self, seat):
+        """Return a single seat to the pool, merging it into the neighbouring runs."""
+        starts, ends = self.starts, self.ends
+        i = bisect_right(starts, seat, self.head)
+        joins_prev = i > self.head and ends[i - 1] + 1 == seat
+        joins_next = i < len(starts) and starts[i] == seat + 1
+
+        if joins_prev and joins_next:
+            ends[i - 1] = ends[i]
+            del starts[i]
+            del ends[i]
+        elif joins_prev:
+            ends[i - 1] = seat
+        elif joins_next:
+            starts[i] = seat
+        elif i == self.head and self.head > 0:
+            # Reuse the slot of an already consumed run instead of shifting the lists
+            self.head -= 1
+            starts[self.head] = seat
+            ends[self.head] = seat
+        else:
+            starts.insert(i, seat)
+            ends.insert(i, seat)
+        self.count += 1
+
+    def _compact(self):
+        """Drop consumed runs once they make up most of the lists."""
+        if self.head >= self._COMPACT_THRESHOLD and self.head * 2 >= len(self.starts):
+            del self.starts[:self.head]
+            del self.ends[:self.head]
+            self.head = 0
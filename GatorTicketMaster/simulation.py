@@ -0,0 +1,172 @@
+import argparse
+import heapq
+import os
+import re
+import sys
+import time
+from collections import deque
+
+from benchmark import percentile
+from gatorTicketMaster import GatorTicketMaster, COMMANDS, parse_command
+
+# <arrival time in seconds> <Operation(args)>, e.g. "12.5 Reserve(3, 2)"
+TIMED_PATTERN = re.compile(r"\s*(\d+(?:\.\d*)?)\s+(.*)$")
+
+# Event kinds, in the order they run when they fall on the same instant
+EXPIRE, DONE, ARRIVAL, SAMPLE = range(4)
+
+
+def read_timed_commands(input_file):
+    """Parse a timestamped command log.
+
+    Returns (commands, errors): commands holds (time, line_number, operation, args) sorted
+    by time and then input order, and errors holds (line_number, message).
+    """
+    commands = []
+    errors = []
+    with open(input_file, 'r') as file:
+        for line_number, line in enumerate(file, 1):
+            match = TIMED_PATTERN.match(line)
+            if match is None:
+                if line.strip():
+                    errors.append((line_number, f"missing arrival time: {line.strip()}"))
+                continue
+            try:
+                command = parse_command(match.group(2))
+            except ValueError as error:
+                errors.append((line_number, str(error)))
+                continue
+            if command is not None:
+                commands.append((float(match.group(1)), line_number, *command))
+    commands.sort(key=lambda command: (command[0], command[1]))
+    return commands, errors
+
+
+class Simulation:
+    """Discrete-event simulation of recorded traffic against one GatorTicketMaster.
+
+    Commands arrive at their recorded times and wait in a FIFO queue for a single server,
+    like the writer in ticket_server.py, that takes service_time seconds per command
+    (service_times can override it per operation). The system's clock is the simulated
+    clock, so holds expire at simulated deadlines. Time only advances from event to
+    event, so a two-hour on-sale runs as fast as the commands execute, and ties are
+    broken by event kind and then scheduling order, so every run is identical.
+    """
+
+    def __init__(self, output_file, service_time=0.001, service_times=None, sample_interval=1.0, sink=None):
+        self.now = 0.0
+        self.system = GatorTicketMaster(output_file, sink=sink, clock=lambda: self.now)
+        self.service_time = service_time
+        self.service_times = service_times or {}
+        self.sample_interval = sample_interval
+        self.events = []  # Heap of (time, kind, sequence, payload)
+        self.sequence = 0
+        self.queue = deque()  # (arrival time, operation, args) waiting for the server
+        self.busy = False
+        self.stopped = False
+        self.max_queue_depth = 0
+        self.waits = []  # Queueing delay of every command served
+        self.series = []  # (time, queue depth, waitlist size, free seats, reservations)
+
+    def _schedule(self, at, kind, payload=None):
+        heapq.heappush(self.events, (at, kind, self.sequence, payload))
+        self.sequence += 1
+
+    def _start_next(self):
+        """Serve the command at the head of the queue."""
+        arrived, operation, args = self.queue.popleft()
+        self.waits.append(self.now - arrived)
+        getattr(self.system, COMMANDS[operation][0])(*args)
+        if operation == "Quit":
+            # Anything after Quit() is not processed
+            self.stopped = True
+            self.queue.clear()
+            return
+        if operation == "Hold":
+            # Wake up when the timer wheel will hand the hold back, not merely at its deadline
+            self._schedule(self.system.hold_timers.fire_time(self.now + args[1]), EXPIRE)
+        self.busy = True
+        self._schedule(self.now + self.service_times.get(operation, self.service_time), DONE)
+
+    def _sample(self):
+        system = self.system
+        self.series.append((self.now, len(self.queue), system.waitlist.size(),
+                            system.available_seats.size(), len(system.reserved_seats)))
+
+    def run(self, commands):
+        """Run (time, line_number, operation, args) commands sorted by time until all work is done."""
+        arrivals = iter(commands)
+        pending = next(arrivals, None)
+        if pending is not None:
+            self._schedule(pending[0], ARRIVAL, pending)
+        self._schedule(0.0, SAMPLE)
+
+        while self.events:
+            self.now, kind, _, payload = heapq.heappop(self.events)
+            if kind == ARRIVAL:
+                if not self.stopped:
+                    arrived, _, operation, args = payload
+                    self.queue.append((arrived, operation, args))
+                    self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+                    pending = next(arrivals, None)
+                    if pending is not None:
+                        self._schedule(pending[0], ARRIVAL, pending)
+            elif kind == DONE:
+                self.busy = False
+            elif kind == EXPIRE:
+                self.system.expire_holds()
+            else:
+                self._sample()
+                if self.events or self.queue or self.busy:
+                    self._schedule(self.now + self.sample_interval, SAMPLE)
+            if not self.busy and self.queue and not self.stopped:
+                self._start_next()
+        self.system.save_output()
+
+    def write_series(self, path):
+        """Write the sampled time series as CSV."""
+        with open(path, 'w') as f:
+            f.write("time,queue_depth,waitlist,available,reserved\n")
+            for sample in self.series:
+                f.write(f"{sample[0]:.6f},{sample[1]},{sample[2]},{sample[3]},{sample[4]}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay timestamped commands through a discrete-event simulation")
+    parser.add_argument("input_file", help="file with one '<seconds> <Command>' per line")
+    parser.add_argument("--service-ms", type=float, default=1.0, help="service time per command (default 1 ms)")
+    parser.add_argument("--op-service-ms", action="append", default=[], metavar="OPERATION=MS",
+                        help="service time for one operation, e.g. ReleaseSeats=20; may be repeated")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples (default 1)")
+    parser.add_argument("--series", metavar="PATH", help="write the queue-depth and waitlist time series as CSV")
+    args = parser.parse_args()
+
+    service_times = {}
+    for override in args.op_service_ms:
+        operation, _, ms = override.partition("=")
+        if operation not in COMMANDS or not ms:
+            parser.error(f"bad --op-service-ms {override!r}")
+        service_times[operation] = float(ms) / 1000
+
+    commands, errors = read_timed_commands(args.input_file)
+    for line_number, message in errors:
+        print(f"{args.input_file}:{line_number}: {message}", file=sys.stderr)
+
+    output_file = f"{os.path.splitext(args.input_file)[0]}_output_file.txt"
+    simulation = Simulation(output_file, args.service_ms / 1000, service_times, args.interval)
+    start = time.perf_counter()
+    simulation.run(commands)
+    elapsed = time.perf_counter() - start
+    if args.series:
+        simulation.write_series(args.series)
+
+    waits = sorted(simulation.waits)
+    print(f"{len(waits)} commands over {simulation.now:.3f}s simulated in {elapsed:.3f}s "
+          f"({simulation.now / elapsed if elapsed else 0:.0f}x real time)")
+    if waits:
+        print(f"queueing delay p50 {percentile(waits, 0.50) * 1e3:.2f} ms, p99 {percentile(waits, 0.99) * 1e3:.2f} ms, "
+              f"max queue depth {simulation.max_queue_depth}")
+
+
+if __name__ == "__main__":
+    main()
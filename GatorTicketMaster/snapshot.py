@@ -0,0 +1,139 @@
+import os
+import struct
+import sys
+from array import array
+
+# File layout: header, then little-endian int64 arrays in the order listed in _COLUMNS. Version 2
+# appends the seat holds: their count, then userIDs, seats and remaining time (float64) as columns.
+MAGIC = b"GTMS"
+VERSION = 2
+_HEADER = struct.Struct("<4sHqqqqqq")  # magic, version, timestamp, total_seats, log_position, #reservations, #runs, #waitlist
+_HOLD_COUNT = struct.Struct("<q")
+_COLUMNS = ("reserved_seats", "reserved_users", "run_starts", "run_ends",
+            "waitlist_priorities", "waitlist_timestamps", "waitlist_users")
+
+
+def _pack(values, typecode='q'):
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _unpack(data, offset, count, typecode='q'):
+    column = array(typecode)
+    column.frombytes(data[offset:offset + 8 * count])
+    if len(column) != count:
+        raise ValueError(f"snapshot column holds {len(column)} values, expected {count}")
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column, offset + 8 * count
+
+
+def _sync_directory(path):
+    """fsync a directory so a rename inside it survives a crash; not supported on every platform."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def save_snapshot(system, path, log_position=0):
+    """Write the full ticketing state of a GatorTicketMaster to path.
+
+    log_position records how many input lines the state reflects, so a restart can
+    replay only the tail of the command log. Holds are stored with the time they have
+    left, so they expire that long after the snapshot is loaded. The file is written next to path, synced
+    and renamed over it, so a crash mid-save leaves the previous snapshot intact.
+    """
+    reservations = list(system.seat_index.items())  # (seat, user) in seat order
+    runs = system.available_seats.runs()
+    waitlist = system.waitlist.entries()  # Already in heap order
+    now = system.clock()
+    holds = [(userID, seat, deadline - now) for userID, (seat, deadline) in system.holds.items()]
+
+    columns = {
+        "reserved_seats": [seat for seat, _ in reservations],
+        "reserved_users": [user for _, user in reservations],
+        "run_starts": [start for start, _ in runs],
+        "run_ends": [end for _, end in runs],
+        "waitlist_priorities": [entry[0] for entry in waitlist],
+        "waitlist_timestamps": [entry[1] for entry in waitlist],
+        "waitlist_users": [entry[2] for entry in waitlist],
+    }
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, system.timestamp, system.total_seats, log_position,
+                             len(reservations), len(runs), len(waitlist)))
+        for name in _COLUMNS:
+            f.write(_pack(columns[name]))
+        f.write(_HOLD_COUNT.pack(len(holds)))
+        f.write(_pack([userID for userID, _, _ in holds]))
+        f.write(_pack([seat for _, seat, _ in holds]))
+        f.write(_pack([remaining for _, _, remaining in holds], 'd'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    _sync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def load_snapshot(system, path):
+    """Restore a snapshot into a freshly constructed GatorTicketMaster and return its log position.
+
+    The reservation trees are bulk-built from sorted arrays and the waitlist is heapified
+    in one pass, so loading is linear apart from one sort of the reservations by userID.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is too short to be a ticketing snapshot")
+    magic, version, timestamp, total_seats, log_position, n_reserved, n_runs, n_waitlist = \
+        _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version not in (1, VERSION):
+        raise ValueError(f"{path} is not a version 1 or {VERSION} ticketing snapshot")
+
+    counts = {"reserved_seats": n_reserved, "reserved_users": n_reserved, "run_starts": n_runs,
+              "run_ends": n_runs, "waitlist_priorities": n_waitlist, "waitlist_timestamps": n_waitlist,
+              "waitlist_users": n_waitlist}
+    expected = _HEADER.size + 8 * sum(counts.values())
+    n_holds = 0
+    if version >= 2:
+        if len(data) >= expected + _HOLD_COUNT.size:
+            n_holds = _HOLD_COUNT.unpack_from(data, expected)[0]
+        expected += _HOLD_COUNT.size + 24 * n_holds
+    if len(data) != expected:
+        raise ValueError(f"{path} is {len(data)} bytes but its header describes {expected}; it is truncated or corrupt")
+    columns = {}
+    offset = _HEADER.size
+    for name in _COLUMNS:
+        columns[name], offset = _unpack(data, offset, counts[name])
+    offset += _HOLD_COUNT.size
+    hold_users, offset = _unpack(data, offset, n_holds)
+    hold_seats, offset = _unpack(data, offset, n_holds)
+    hold_remaining, offset = _unpack(data, offset, n_holds, 'd')
+
+    if not (system.reserved_seats.is_empty() and system.waitlist.is_empty() and system.available_seats.is_empty()):
+        raise ValueError("snapshots can only be loaded into an empty system")
+
+    seats, users = columns["reserved_seats"], columns["reserved_users"]
+    system.seat_index.bulk_load(zip(seats, users))
+    system.reserved_seats.bulk_load(sorted(zip(users, seats)))
+    for start, end in zip(columns["run_starts"], columns["run_ends"]):
+        system.available_seats.add_range(start, end)
+    system.waitlist.insert_many(zip(columns["waitlist_priorities"], columns["waitlist_timestamps"],
+                                    columns["waitlist_users"]))
+    system.timestamp = timestamp
+    system.total_seats = total_seats
+    # Held seats are already among the reservations; rearm their expiry on this system's clock
+    now = system.clock()
+    for userID, seat, remaining in zip(hold_users, hold_seats, hold_remaining):
+        deadline = now + remaining
+        system.holds[userID] = (seat, deadline)
+        system.hold_timers.schedule(deadline, (userID, seat, deadline))
+    return log_position
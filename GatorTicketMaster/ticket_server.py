@@ -0,0 +1,207 @@
+import argparse
+import asyncio
+
+from gatorTicketMaster import GatorTicketMaster, COMMANDS, parse_command, recover_from_log
+from output_sink import MemorySink, NullSink
+from write_ahead_log import WriteAheadLog
+
+# Commands that never mutate state and can run without waiting behind queued writes
+READ_ONLY = {"Available", "PrintReservations"}
+
+
+class TicketServer:
+    """Serves the Operation(args) line protocol to many clients over one GatorTicketMaster.
+
+    Mutating commands go through a single writer task, so the heap and trees are only
+    touched by one coroutine at a time and need no locks. Read-only commands never enter
+    the write queue: they run as soon as the connection's own earlier writes have been
+    applied, without waiting behind writes queued by other clients. Each connection may
+    pipeline commands; responses come back in request order, each terminated by an empty line.
+    """
+
+    def __init__(self, system):
+        self.system = system
+        self.system.sink = MemorySink()  # Drained after every command into its response
+        self.queue = asyncio.Queue()
+        self.writer_task = None
+        self.sweeper_task = None
+
+    def _read(self, operation, args, response):
+        """Answer a read-only command into response.
+
+        With published views the read runs on a worker thread against the latest view,
+        so even a long PrintReservations never holds up the writer. Views are published
+        after every write, so the latest one already includes the connection's own writes.
+        """
+        view = self.system.view
+        if view is None:
+            response.set_result(self._execute(operation, args))
+            return
+        done = asyncio.get_running_loop().run_in_executor(None, view.run, operation, args)
+        done.add_done_callback(lambda future: response.set_result(future.result()))
+
+    def _execute(self, operation, args):
+        """Run one command and return its output lines."""
+        getattr(self.system, COMMANDS[operation][0])(*args)
+        lines = self.system.sink.lines
+        self.system.sink.lines = []
+        return lines
+
+    async def _writer(self):
+        """Apply queued mutations one at a time, in arrival order.
+
+        Each write resolves its applied future as soon as it has run, and the reads
+        pipelined behind it run from that future's callbacks before the next write is
+        applied. With a write-ahead log, responses are held until the group commit that
+        covers their records, so a client is never told a write succeeded before it is
+        durable. The fsync runs on a worker thread so connections and reads keep going.
+        """
+        loop = asyncio.get_running_loop()
+        unsynced = []  # (response, lines) whose log records have not been committed yet
+        while True:
+            operation, args, applied, response = await self.queue.get()
+            if response is None:
+                # Hold expiry sweep queued by _sweeper; nobody is waiting for its output
+                self.system.expire_holds()
+                self.system.sink.lines = []
+                lines = None
+            else:
+                try:
+                    lines = self._execute(operation, args)
+                except Exception as error:
+                    lines = [f"ERROR {error}"]
+            if self.system.view is not None:
+                self.system.publish_view()  # Before the reads waiting on this write run
+            if applied is not None:
+                applied.set_result(None)  # Its callbacks run at the next await, before another write
+            wal = self.system.wal
+            if wal is None:
+                if lines is not None:
+                    response.set_result(lines)
+            else:
+                if lines is not None:
+                    unsynced.append((response, lines))
+                if self.queue.empty() or len(unsynced) >= wal.batch_records:
+                    # Group commit: sync once the burst of queued writes has drained, then reply
+                    await loop.run_in_executor(None, wal.commit)
+                    for response, lines in unsynced:
+                        response.set_result(lines)
+                    unsynced = []
+            await asyncio.sleep(0)  # Let readers and connection handlers run between writes
+
+    async def _sweeper(self):
+        """Queue a hold expiry sweep every timer wheel tick while there are outstanding holds."""
+        while True:
+            await asyncio.sleep(self.system.hold_timers.resolution)
+            if self.system.holds:
+                self.queue.put_nowait((None, (), None, None))
+
+    def _submit(self, line, last_write):
+        """Start handling one request line.
+
+        Returns (operation, future for its response lines, future resolved once the
+        command is applied, or None for anything but a write). last_write is the applied
+        future of the connection's most recent write; reads wait only for it, not for
+        the write to become durable.
+        """
+        loop = asyncio.get_running_loop()
+        response = loop.create_future()
+        try:
+            command = parse_command(line)
+        except ValueError as error:
+            response.set_result([f"ERROR {error}"])
+            return None, response, None
+        if command is None:
+            return None, None, None
+
+        operation, args = command
+        if operation == "Quit":
+            # Quit ends the client's session; the shared system keeps running
+            response.set_result(["Program Terminated!!"])
+        elif operation in READ_ONLY:
+            if last_write is None or last_write.done():
+                self._read(operation, args, response)
+            else:
+                last_write.add_done_callback(lambda _: self._read(operation, args, response))
+        else:
+            applied = loop.create_future()
+            self.queue.put_nowait((operation, args, applied, response))
+            return operation, response, applied
+        return operation, response, None
+
+    async def _send_responses(self, responses, writer):
+        """Write responses back in request order as their futures complete."""
+        while True:
+            response = await responses.get()
+            if response is None:
+                break
+            lines = await response
+            writer.write(("\n".join(lines) + "\n\n").encode())
+            await writer.drain()
+
+    async def handle_client(self, reader, writer):
+        responses = asyncio.Queue()
+        sender = asyncio.create_task(self._send_responses(responses, writer))
+        last_write = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                operation, response, applied = self._submit(line.decode(), last_write)
+                if response is not None:
+                    responses.put_nowait(response)
+                if applied is not None:
+                    last_write = applied
+                if operation == "Quit":
+                    break
+        finally:
+            responses.put_nowait(None)
+            await sender
+            writer.close()
+            await writer.wait_closed()
+
+    async def serve(self, host=None, port=None, unix_path=None):
+        """Listen on a TCP port or a Unix socket until cancelled."""
+        self.writer_task = asyncio.create_task(self._writer())
+        self.sweeper_task = asyncio.create_task(self._sweeper())
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.writer_task.cancel()
+            self.sweeper_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Gator Ticket Master command protocol over TCP or a Unix socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--wal", metavar="PATH", help="record mutating commands to a write-ahead log")
+    parser.add_argument("--views", action="store_true",
+                        help="serve reads from published immutable views on worker threads")
+    args = parser.parse_args()
+
+    wal = WriteAheadLog(args.wal) if args.wal else None
+    system = GatorTicketMaster(None, sink=NullSink(), wal=wal, views=args.views)
+    if wal is not None:
+        # Resume from the state the log describes, so new records extend what clients saw
+        recover_from_log(system, args.wal)
+        if system.view is not None:
+            system.publish_view()
+    try:
+        asyncio.run(TicketServer(system).serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if wal is not None:
+            wal.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+class TimerWheel:
+    """Hashed timer wheel for deadlines on a monotonic clock.
+
+    Time is cut into ticks of `resolution` clock units and each timer goes into the slot
+    for its tick modulo the wheel size. Advancing to a new time only visits the slots of
+    the ticks that passed, so the cost depends on the timers that fall due rather than on
+    the total number scheduled. Timers due more than one rotation ahead stay in their
+    slot until their own tick comes around.
+
+    Timers never fire early: a deadline inside a tick fires once that whole tick has passed.
+    There is no cancel; callers check whether a fired item is still current.
+    """
+
+    def __init__(self, start=0, resolution=1, slots=1024):
+        self.resolution = resolution
+        self.slots = [[] for _ in range(slots)]
+        self.tick = int(start // resolution)  # Last tick that has been swept
+        self.count = 0
+        self._sequence = 0  # Keeps timers with the same tick in scheduling order
+
+    def __len__(self):
+        return self.count
+
+    def _tick_for(self, deadline):
+        tick = -int(-deadline // self.resolution)  # Round up so the timer cannot fire early
+        return max(tick, self.tick + 1)  # Already-swept ticks are not visited again
+
+    def fire_time(self, deadline):
+        """Return the clock value at which a timer scheduled now for deadline will be returned by advance."""
+        return self._tick_for(deadline) * self.resolution
+
+    def schedule(self, deadline, item):
+        """Fire item once the clock reaches deadline."""
+        tick = self._tick_for(deadline)
+        self.slots[tick % len(self.slots)].append((tick, self._sequence, item))
+        self._sequence += 1
+        self.count += 1
+
+    def advance(self, now):
+        """Move the wheel to time now and return the items that fell due, by tick and then scheduling order."""
+        target = int(now // self.resolution)
+        if target <= self.tick:
+            return []
+        size = len(self.slots)
+        if target - self.tick >= size:
+            visited = range(size)  # A full rotation or more passed, so every slot is due
+        else:
+            visited = (tick % size for tick in range(self.tick + 1, target + 1))
+
+        expired = []
+        for index in visited:
+            slot = self.slots[index]
+            if not slot:
+                continue
+            due = [timer for timer in slot if timer[0] <= target]
+            if len(due) == len(slot):
+                self.slots[index] = []
+            else:
+                self.slots[index] = [timer for timer in slot if timer[0] > target]
+            expired.extend(due)
+        self.tick = target
+        self.count -= len(expired)
+        expired.sort(key=lambda timer: (timer[0], timer[1]))
+        return [item for _, _, item in expired]
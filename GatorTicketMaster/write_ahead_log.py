@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+
+
+class WriteAheadLog:
+    """Append-only log of mutating commands with group commit.
+
+    Records are written in the same Operation(args) format as the input files and made
+    durable with one fsync per group: after batch_records records, or once batch_ms
+    milliseconds have passed since the last sync, whichever comes first. A background
+    thread enforces the time limit, so records are synced on time even when no further
+    command arrives, as with an idle stdin stream or server.
+    """
+
+    def __init__(self, path, batch_records=128, batch_ms=10.0):
+        self.path = path
+        _truncate_torn_tail(path)
+        self.file = open(path, 'a')
+        self.batch_records = batch_records
+        self.batch_seconds = batch_ms / 1000.0
+        self.pending = 0  # Records written since the last fsync
+        self.last_sync = time.monotonic()
+        self.condition = threading.Condition()  # Guards the file and pending; wakes the flusher
+        self.flusher = threading.Thread(target=self._flush_on_deadline, daemon=True)
+        self.flusher.start()
+
+    def append(self, operation, args):
+        """Log one command; it is durable once the group it belongs to is committed."""
+        with self.condition:
+            self.file.write(f"{operation}({', '.join(map(str, args))})\n")
+            self.pending += 1
+            if self.pending >= self.batch_records or time.monotonic() - self.last_sync >= self.batch_seconds:
+                self._commit()
+            elif self.pending == 1:
+                self.condition.notify()  # Start the clock on this group
+
+    def commit(self):
+        """Flush and fsync every pending record."""
+        with self.condition:
+            self._commit()
+
+    def _commit(self):
+        if self.pending:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def _flush_on_deadline(self):
+        """Commit a pending group once batch_ms has passed since the last sync."""
+        with self.condition:
+            while self.file is not None:
+                if not self.pending:
+                    self.condition.wait()
+                    continue
+                remaining = self.last_sync + self.batch_seconds - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                else:
+                    self._commit()
+
+    def close(self):
+        """Commit the remaining records and close the log; safe to call more than once."""
+        with self.condition:
+            if self.file is None:
+                return
+            self._commit()
+            self.file.close()
+            self.file = None
+            self.condition.notify()
+        self.flusher.join()
+
+
+def read_log(path):
+    """Yield the command lines of a log, ignoring a torn final record left by a crash."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # Partially written record
+            yield line
+
+
+def _truncate_torn_tail(path, chunk_size=4096):
+    """Cut a partially written final record so new records start on a fresh line."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline != -1:
+                cut = start + newline + 1
+                break
+            position = start
+        else:
+            cut = 0
+        if cut != end:
+            f.truncate(cut)